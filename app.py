@@ -7,23 +7,27 @@ import streamlit as st
 import os
 import sys
 import numpy as np
-import json
 from datetime import datetime
-import tempfile
 import time
+import uuid
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# Keep TensorFlow (pulled in by CREPE) quiet if it does get loaded
+os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.audio_processor import AudioProcessor
-from src.pitch_detector import PitchDetector
-from src.note_converter import NoteConverter
-from src.visualizer import AudioVisualizer
-from src.midi_exporter import MidiExporter
-from src.song_comparator import SongComparator
-from src.config import OUTPUT_DIR, TEMP_DIR
-from src.utils import validate_url, format_time, get_file_size_mb
-import yt_dlp
+# Heavy audio/ML modules (librosa, matplotlib, mido, yt_dlp, ...) are imported
+# inside the functions that use them so the first page render stays fast
+from src.config import OUTPUT_DIR, FFMPEG_BIN, ensure_dirs
+from src.utils import validate_url, format_time, safe_divide, dumps_json, loads_json, get_logger
+
+logger = get_logger(__name__)
 
 # Page configuration
 st.set_page_config(
@@ -34,661 +38,134 @@ st.set_page_config(
 )
 
 # Custom CSS - Modern Music App Theme
-st.markdown("""
-<style>
-    /* Import modern fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&family=Orbitron:wght@500;700;900&display=swap');
-    
-    /* Main app background with gradient and music pattern */
-    .stApp {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 25%, #f093fb 50%, #667eea 75%, #764ba2 100%);
-        background-size: 400% 400%;
-        animation: gradientShift 15s ease infinite;
-    }
-    
-    @keyframes gradientShift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    
-    /* Music wave pattern overlay */
-    .stApp::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background-image: 
-            repeating-linear-gradient(
-                90deg,
-                rgba(255, 255, 255, 0.03) 0px,
-                rgba(255, 255, 255, 0.03) 1px,
-                transparent 1px,
-                transparent 20px
-            ),
-            repeating-linear-gradient(
-                0deg,
-                rgba(255, 255, 255, 0.03) 0px,
-                rgba(255, 255, 255, 0.03) 1px,
-                transparent 1px,
-                transparent 20px
-            );
-        pointer-events: none;
-        z-index: 0;
-    }
-    
-    /* Main content area with glass morphism */
-    [data-testid="stAppViewContainer"] > .main {
-        background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(10px);
-        border-radius: 20px;
-        padding: 2rem;
-        box-shadow: 0 8px 32px 0 rgba(31, 38, 135, 0.37);
-    }
-    
-    /* Sidebar styling */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(102, 126, 234, 0.9) 0%, rgba(118, 75, 162, 0.9) 100%);
-        backdrop-filter: blur(10px);
-    }
-    
-    [data-testid="stSidebar"] > div:first-child {
-        background: transparent;
-    }
-    
-    /* Headers with glow effect */
-    .main-header {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 3.5rem;
-        font-weight: 900;
-        text-align: center;
-        background: linear-gradient(45deg, #fff, #f093fb, #fff);
-        background-size: 200% 200%;
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        animation: textGlow 3s ease infinite;
-        text-shadow: 0 0 30px rgba(240, 147, 251, 0.5);
-        margin-bottom: 1rem;
-        letter-spacing: 2px;
-    }
-    
-    @keyframes textGlow {
-        0%, 100% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-    }
-    
-    .sub-header {
-        font-family: 'Poppins', sans-serif;
-        font-size: 1.3rem;
-        text-align: center;
-        color: rgba(255, 255, 255, 0.9);
-        margin-bottom: 2rem;
-        font-weight: 300;
-        text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);
-    }
-    
-    /* All text in white with shadow for readability */
-    h1, h2, h3, h4, h5, h6, p, label, .stMarkdown {
-        color: white !important;
-        text-shadow: 0 2px 4px rgba(0, 0, 0, 0.3);
-        font-family: 'Poppins', sans-serif;
-    }
-    
-    /* =================================
-       TABS - MODERN MUSIC STYLE
-       ================================= */
-    
-    /* Tab container */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 15px;
-        background: linear-gradient(135deg, rgba(30, 30, 60, 0.8) 0%, rgba(50, 50, 90, 0.8) 100%);
-        backdrop-filter: blur(15px);
-        border-radius: 20px;
-        padding: 12px 15px;
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.3);
-        border: 2px solid rgba(102, 126, 234, 0.4);
-    }
-    
-    /* Individual tab button */
-    .stTabs [data-baseweb="tab"] {
-        font-family: 'Poppins', sans-serif;
-        font-weight: 700;
-        height: 75px;
-        min-width: 180px;
-        background: linear-gradient(135deg, rgba(60, 60, 100, 0.6) 0%, rgba(80, 80, 120, 0.6) 100%);
-        border-radius: 16px;
-        color: white;
-        font-size: 1.3rem;
-        letter-spacing: 0.5px;
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        border: 2px solid rgba(255, 255, 255, 0.1);
-        padding: 0 25px;
-        text-shadow: 0 2px 4px rgba(0, 0, 0, 0.4);
-        position: relative;
-        overflow: hidden;
-    }
-    
-    /* Tab glow effect on hover */
-    .stTabs [data-baseweb="tab"]::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255, 255, 255, 0.2), transparent);
-        transition: left 0.5s;
-    }
-    
-    .stTabs [data-baseweb="tab"]:hover::before {
-        left: 100%;
-    }
-    
-    /* Hover state */
-    .stTabs [data-baseweb="tab"]:hover {
-        background: linear-gradient(135deg, rgba(102, 126, 234, 0.7) 0%, rgba(118, 75, 162, 0.7) 100%);
-        transform: translateY(-5px) scale(1.05);
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.5);
-        border-color: rgba(255, 255, 255, 0.3);
-    }
-    
-    /* Active/Selected tab */
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%) !important;
-        box-shadow: 0 8px 30px rgba(102, 126, 234, 0.6), 0 0 40px rgba(240, 147, 251, 0.4) !important;
-        border: 2px solid rgba(255, 255, 255, 0.5) !important;
-        transform: translateY(-3px) scale(1.08);
-        font-weight: 900;
-    }
-    
-    /* Active tab pulse animation */
-    @keyframes tabPulse {
-        0%, 100% {
-            box-shadow: 0 8px 30px rgba(102, 126, 234, 0.6), 0 0 40px rgba(240, 147, 251, 0.4);
-        }
-        50% {
-            box-shadow: 0 8px 35px rgba(102, 126, 234, 0.8), 0 0 50px rgba(240, 147, 251, 0.6);
-        }
-    }
-    
-    .stTabs [aria-selected="true"] {
-        animation: tabPulse 2s ease-in-out infinite;
-    }
-    
-    /* Tab emoji/icon spacing */
-    .stTabs [data-baseweb="tab"] span {
-        display: inline-flex;
-        align-items: center;
-        gap: 8px;
-    }
-    
-    /* Buttons with modern gradient */
-    .stButton>button {
-        width: 100%;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        font-weight: 600;
-        font-family: 'Poppins', sans-serif;
-        border: none;
-        border-radius: 12px;
-        padding: 0.75rem 2rem;
-        font-size: 1.1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    .stButton>button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 25px rgba(102, 126, 234, 0.6);
-        background: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
-    }
-    
-    .stButton>button:active {
-        transform: translateY(-1px);
-    }
-    
-    /* Input fields */
-    .stTextInput>div>div>input,
-    .stSelectbox>div>div>div,
-    .stNumberInput>div>div>input {
-        background: rgba(255, 255, 255, 0.15) !important;
-        backdrop-filter: blur(10px);
-        border: 2px solid rgba(255, 255, 255, 0.2) !important;
-        border-radius: 12px;
-        color: white !important;
-        font-family: 'Poppins', sans-serif;
-        padding: 0.75rem;
-    }
-    
-    .stTextInput>div>div>input::placeholder {
-        color: rgba(255, 255, 255, 0.6);
-    }
-    
-    /* =================================
-       SELECTBOX - STANDARD STYLING
-       ================================= */
-    
-    /* Container */
-    .stSelectbox {
-        width: 100% !important;
-    }
-    
-    .stSelectbox > div {
-        width: 100% !important;
-    }
-    
-    .stSelectbox label {
-        font-size: 1.05rem !important;
-        font-weight: 600 !important;
-        margin-bottom: 0.5rem !important;
-        color: white !important;
-    }
-    
-    /* Main selectbox control - SOLID DARK BLUE */
-    .stSelectbox [data-baseweb="select"] {
-        background-color: #2c3e87 !important;
-        border-radius: 10px !important;
-        min-height: 55px !important;
-    }
-    
-    /* Control container */
-    .stSelectbox [data-baseweb="select"] > div {
-        background-color: #2c3e87 !important;
-        border: 2px solid #5568c4 !important;
-        border-radius: 10px !important;
-        min-height: 55px !important;
-        padding: 0 1rem !important;
-    }
-    
-    /* Value container - holds the selected text */
-    .stSelectbox [data-baseweb="select"] [data-baseweb="value-container"] {
-        padding: 0.75rem 0 !important;
-    }
-    
-    /* Selected value text - BRIGHT WHITE */
-    .stSelectbox [data-baseweb="select"] [data-baseweb="single-value"] {
-        color: #FFFFFF !important;
-        font-size: 1.15rem !important;
-        font-weight: 600 !important;
-        letter-spacing: 0.5px !important;
-    }
-    
-    /* Placeholder */
-    .stSelectbox [data-baseweb="select"] [data-baseweb="placeholder"] {
-        color: rgba(255, 255, 255, 0.6) !important;
-        font-size: 1.15rem !important;
-    }
-    
-    /* Dropdown arrow */
-    .stSelectbox [data-baseweb="select"] svg {
-        fill: #FFFFFF !important;
-        width: 20px !important;
-        height: 20px !important;
-    }
-    
-    /* Input (if any) */
-    .stSelectbox [data-baseweb="select"] input {
-        color: #FFFFFF !important;
-        font-size: 1.15rem !important;
-    }
-    
-    /* All text inside select */
-    .stSelectbox [data-baseweb="select"] div,
-    .stSelectbox [data-baseweb="select"] span {
-        color: #FFFFFF !important;
-    }
-    
-    /* =================================
-       DROPDOWN MENU - STANDARD STYLING
-       ================================= */
-    
-    /* Dropdown container/popover */
-    [data-baseweb="popover"] {
-        background-color: #1a2456 !important;
-        border-radius: 10px !important;
-        box-shadow: 0 8px 24px rgba(0, 0, 0, 0.5) !important;
-        border: 2px solid #5568c4 !important;
-        z-index: 9999 !important;
-    }
-    
-    /* List container */
-    [role="listbox"] {
-        background-color: #1a2456 !important;
-        border-radius: 10px !important;
-        padding: 0.5rem !important;
-    }
-    
-    /* Each dropdown option */
-    [role="option"] {
-        background-color: #2c3e87 !important;
-        color: #FFFFFF !important;
-        font-family: 'Poppins', sans-serif !important;
-        font-size: 1.1rem !important;
-        font-weight: 500 !important;
-        padding: 0.9rem 1.2rem !important;
-        border-radius: 8px !important;
-        margin-bottom: 0.4rem !important;
-        cursor: pointer !important;
-        min-height: 48px !important;
-        display: flex !important;
-        align-items: center !important;
-        transition: all 0.2s ease !important;
-    }
-    
-    /* Hover state */
-    [role="option"]:hover {
-        background-color: #4a5fc1 !important;
-        color: #FFFFFF !important;
-        transform: translateX(4px) !important;
-    }
-    
-    /* Selected/active option */
-    [role="option"][aria-selected="true"] {
-        background-color: #5568c4 !important;
-        color: #FFFFFF !important;
-        font-weight: 700 !important;
-        border-left: 4px solid #9ca9ff !important;
-    }
-    
-    /* Menu wrapper */
-    [data-baseweb="menu"] {
-        background-color: #1a2456 !important;
-        border-radius: 10px !important;
-    }
-    
-    [data-baseweb="menu"] li {
-        color: #FFFFFF !important;
-        font-size: 1.1rem !important;
-    }
-    
-    /* File uploader */
-    [data-testid="stFileUploader"] {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        padding: 2rem;
-        border: 2px dashed rgba(255, 255, 255, 0.3);
-        transition: all 0.3s ease;
-    }
-    
-    [data-testid="stFileUploader"]:hover {
-        border-color: rgba(255, 255, 255, 0.6);
-        background: rgba(255, 255, 255, 0.15);
-    }
-    
-    /* Sliders */
-    .stSlider>div>div>div {
-        background: linear-gradient(90deg, #667eea 0%, #f093fb 100%);
-    }
-    
-    .stSlider label {
-        color: white !important;
-    }
-    
-    /* Checkboxes and radio buttons */
-    .stCheckbox, .stRadio {
-        color: white !important;
-    }
-    
-    .stCheckbox label, .stRadio label {
-        color: white !important;
-    }
-    
-    .stCheckbox span, .stRadio span {
-        color: white !important;
-    }
-    
-    /* Radio button circles */
-    [role="radiogroup"] label {
-        color: white !important;
-    }
-    
-    /* Success/Info/Warning boxes with glass effect */
-    .success-box, .stSuccess {
-        padding: 1.5rem;
-        background: rgba(76, 175, 80, 0.2) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border-left: 5px solid #4CAF50;
-        color: white !important;
-        box-shadow: 0 4px 15px rgba(76, 175, 80, 0.3);
-    }
-    
-    .info-box, .stInfo {
-        padding: 1.5rem;
-        background: rgba(33, 150, 243, 0.2) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border-left: 5px solid #2196F3;
-        color: white !important;
-        box-shadow: 0 4px 15px rgba(33, 150, 243, 0.3);
-    }
-    
-    .stWarning {
-        padding: 1.5rem;
-        background: rgba(255, 152, 0, 0.2) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border-left: 5px solid #FF9800;
-        color: white !important;
-        box-shadow: 0 4px 15px rgba(255, 152, 0, 0.3);
-    }
-    
-    .stError {
-        padding: 1.5rem;
-        background: rgba(244, 67, 54, 0.2) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        border-left: 5px solid #F44336;
-        color: white !important;
-        box-shadow: 0 4px 15px rgba(244, 67, 54, 0.3);
-    }
-    
-    /* Metrics with modern cards */
-    [data-testid="stMetricValue"] {
-        font-family: 'Orbitron', sans-serif;
-        font-size: 2rem;
-        font-weight: 700;
-        color: white;
-    }
-    
-    [data-testid="stMetric"] {
-        background: rgba(255, 255, 255, 0.1);
-        backdrop-filter: blur(10px);
-        padding: 1.5rem;
-        border-radius: 15px;
-        border: 1px solid rgba(255, 255, 255, 0.2);
-        box-shadow: 0 4px 15px rgba(0, 0, 0, 0.2);
-    }
-    
-    /* Expanders */
-    .streamlit-expanderHeader {
-        background: rgba(255, 255, 255, 0.1) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 12px;
-        color: white !important;
-        font-family: 'Poppins', sans-serif;
-        font-weight: 600;
-    }
-    
-    .streamlit-expanderContent {
-        background: rgba(255, 255, 255, 0.05);
-        backdrop-filter: blur(10px);
-        border-radius: 0 0 12px 12px;
-    }
-    
-    /* Progress bars */
-    .stProgress > div > div > div {
-        background: linear-gradient(90deg, #667eea 0%, #f093fb 100%);
-        border-radius: 10px;
-    }
-    
-    /* Dataframes and tables */
-    .dataframe {
-        background: rgba(255, 255, 255, 0.1) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 12px;
-        color: white !important;
-    }
-    
-    /* Plotly charts background */
-    .js-plotly-plot {
-        background: rgba(255, 255, 255, 0.05) !important;
-        backdrop-filter: blur(10px);
-        border-radius: 15px;
-        padding: 1rem;
-    }
-    
-    /* Spinner */
-    .stSpinner > div {
-        border-top-color: #f093fb !important;
-    }
-    
-    /* Download buttons */
-    .stDownloadButton>button {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        color: white;
-        font-weight: 600;
-        border-radius: 12px;
-        padding: 0.75rem 2rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 4px 15px rgba(240, 147, 251, 0.4);
-    }
-    
-    .stDownloadButton>button:hover {
-        transform: translateY(-3px);
-        box-shadow: 0 6px 25px rgba(240, 147, 251, 0.6);
-    }
-    
-    /* Scrollbar styling */
-    ::-webkit-scrollbar {
-        width: 10px;
-        height: 10px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(255, 255, 255, 0.1);
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-    }
-    
-    ::-webkit-scrollbar-thumb:hover {
-        background: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
-    }
-    
-    /* Music equalizer animation for header */
-    @keyframes equalize {
-        0%, 100% { height: 10px; }
-        50% { height: 30px; }
-    }
-    
-    /* Add subtle animation to cards */
-    @keyframes float {
-        0%, 100% { transform: translateY(0px); }
-        50% { transform: translateY(-5px); }
-    }
-    
-    [data-testid="stMetric"] {
-        animation: float 3s ease-in-out infinite;
-    }
-    
-    /* Footer branding */
-    .footer-branding {
-        position: fixed;
-        bottom: 0;
-        left: 0;
-        right: 0;
-        width: 100%;
-        background: rgba(26, 36, 86, 0.98);
-        backdrop-filter: blur(15px);
-        padding: 1rem 2rem;
-        text-align: center;
-        border-top: 2px solid rgba(255, 255, 255, 0.3);
-        z-index: 9999 !important;
-        font-family: 'Poppins', sans-serif;
-        box-shadow: 0 -4px 20px rgba(0, 0, 0, 0.3);
-    }
-    
-    .footer-branding p {
-        margin: 0;
-        color: #ffffff;
-        font-size: 0.95rem;
-        font-weight: 500;
-    }
-    
-    .footer-branding a {
-        color: #f093fb;
-        text-decoration: none;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .footer-branding a:hover {
-        color: #667eea;
-        text-decoration: underline;
-    }
-    
-    .brand-name {
-        color: #f093fb;
-        font-weight: 700;
-        font-size: 1.05rem;
-    }
-    
-    /* Add padding to main content to prevent footer overlap */
-    .main .block-container {
-        padding-bottom: 90px !important;
-    }
-    
-    /* Ensure tabs don't overlap footer */
-    [data-testid="stTabs"] {
-        margin-bottom: 90px;
-    }
-    
-    /* Ensure all tab content has proper spacing */
-    [data-baseweb="tab-panel"] {
-        padding-bottom: 30px;
-    }
-</style>
-""", unsafe_allow_html=True)
+CSS_PATH = os.path.join(os.path.dirname(__file__), 'static', 'app.css')
+
+
+@st.cache_data(show_spinner=False)
+def _get_css():
+    """
+    Load the app stylesheet once per server process
+
+    Returns:
+        str: <style> block ready for st.markdown
+    """
+    with open(CSS_PATH, 'r') as f:
+        return f"<style>\n{f.read()}</style>"
+
+
+@st.cache_data(show_spinner=False)
+def _get_page_header():
+    """
+    Build the static page preamble (stylesheet + header) once
+    
+    Streamlit drops any element that is not re-emitted on a rerun, so the
+    preamble still has to be sent every run; combining it into one cached
+    string keeps that to a single markdown element.
+    
+    Returns:
+        str: HTML for st.markdown
+    """
+    return (
+        _get_css()
+        + '<div class="main-header">🎵 Raga Musikraum 🎶</div>'
+        + '<div class="sub-header">✨ Transform Audio into Musical Notes | Practice Your Voice | Compare Songs ✨</div>'
+    )
 
 
 # Initialize session state
-if 'analysis_complete' not in st.session_state:
-    st.session_state.analysis_complete = False
-if 'results' not in st.session_state:
-    st.session_state.results = None
+for key, default in (('analysis_complete', False), ('results', None)):
+    st.session_state.setdefault(key, default)
+
+
+# Pickle-safe subset of yt_dlp's info dict that the analysis stage needs
+VIDEO_INFO_KEYS = ('title', 'duration', 'uploader', 'view_count', 'url', 'http_headers')
+
+
+# Seconds to wait for the extractor worker to resolve a URL
+YDL_WORKER_TIMEOUT = 30
+
+
+@st.cache_resource(show_spinner=False)
+def _get_ydl_worker():
+    """
+    Long-lived yt_dlp extractor shared by every session of this server
+    
+    Streamlit runs all sessions as threads of one process, so a single
+    YoutubeDL (extractors loaded once) owned by a single worker thread
+    serves every URL lookup; calls are serialized through the worker.
+    
+    Returns:
+        tuple: (YoutubeDL instance, single-thread executor that owns it)
+    """
+    import yt_dlp
+    
+    ydl = yt_dlp.YoutubeDL({
+        'quiet': True,
+        'no_warnings': True,
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
+        'skip_download': True,
+        'socket_timeout': 5,
+    })
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ydl-worker')
+    return ydl, executor
+
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def _extract_video_info(url):
+    """
+    Resolve a YouTube URL once and memoize the result for 5 minutes
+    
+    Returns:
+        dict: Subset of the video info (see VIDEO_INFO_KEYS), or None
+    """
+    ydl, executor = _get_ydl_worker()
+    future = executor.submit(ydl.extract_info, url, download=False)
+    try:
+        info = future.result(timeout=YDL_WORKER_TIMEOUT)
+    except FuturesTimeoutError:
+        if not future.cancel():
+            # Still running on the worker: retire it so later lookups get a
+            # fresh worker instead of queueing behind the stuck one
+            _get_ydl_worker.clear()
+            executor.shutdown(wait=False)
+        raise ValueError("Timed out extracting video information")
+    if not info:
+        return None
+    return {key: info.get(key) for key in VIDEO_INFO_KEYS}
+
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _probe_video_accessibility(url):
+    """
+    Probe a YouTube URL, raising on failure
+    
+    Only successful probes are memoized (st.cache_data does not cache
+    calls that raise), so a transient network error is retried on the
+    next click instead of sticking for 10 minutes.
+    """
+    if not _extract_video_info(url):
+        raise ValueError("Cannot extract video information")
+    return True
 
 
 def check_video_accessibility(url):
     """
     Quick check if a YouTube video is accessible for streaming
     
+    Successful checks are memoized per URL for 10 minutes so repeat clicks
+    skip the network round-trip; failures are always re-checked.
+    
     Returns:
         tuple: (is_accessible, error_message)
     """
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': True,
-        }
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            if info:
-                return True, None
-            return False, "Cannot extract video information"
+        _probe_video_accessibility(url)
+        return True, None
     except Exception as e:
         error_msg = str(e).lower()
-        if 'private' in error_msg:
+        if 'cannot extract video information' in error_msg:
+            return False, "Cannot extract video information"
+        elif 'private' in error_msg:
             return False, "Video is private"
         elif 'age' in error_msg or 'restricted' in error_msg:
             return False, "Video is age-restricted or region-locked"
@@ -698,42 +175,370 @@ def check_video_accessibility(url):
             return False, f"Cannot access video: {str(e)}"
 
 
+# Bytes of FFmpeg's stderr kept for error messages
+FFMPEG_STDERR_TAIL = 4096
+
+
+def _run_ffmpeg(args, stdin_bytes=None, timeout=60):
+    """
+    Run FFmpeg (resolved once at import as FFMPEG_BIN) with piped I/O
+    
+    Args:
+        args: FFmpeg arguments, without the binary itself
+        stdin_bytes: Data to feed on stdin, if any
+        timeout: Seconds before the process is killed
+        
+    Returns:
+        tuple: (returncode, stdout bytes, stderr bytes); on failure only
+            the last FFMPEG_STDERR_TAIL bytes of stderr are kept
+        
+    Raises:
+        subprocess.TimeoutExpired: If FFmpeg runs longer than timeout
+    """
+    import subprocess
+    
+    process = subprocess.Popen(
+        [FFMPEG_BIN, '-hide_banner', '-loglevel', 'error', *args],
+        stdin=subprocess.PIPE if stdin_bytes is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=1 << 20
+    )
+    try:
+        stdout, stderr = process.communicate(stdin_bytes, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    
+    if process.returncode != 0:
+        logger.warning(f"FFmpeg exited with {process.returncode} ({len(stderr)} bytes on stderr)")
+        stderr = stderr[-FFMPEG_STDERR_TAIL:]
+    return process.returncode, stdout, stderr
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _decode_raw_preview(raw_bytes, audio_format, sample_rate, channels):
+    """
+    Decode RAW PCM to WAV in memory by piping it through FFmpeg
+    
+    Memoized so re-previewing the same upload with unchanged settings is
+    instant.
+    
+    Returns:
+        bytes: WAV file contents
+        
+    Raises:
+        RuntimeError: If FFmpeg fails to decode the input
+    """
+    returncode, wav_bytes, stderr = _run_ffmpeg([
+        '-f', audio_format,
+        '-ar', str(sample_rate),
+        '-ac', str(channels),
+        '-i', 'pipe:0',
+        '-f', 'wav',
+        'pipe:1'
+    ], stdin_bytes=raw_bytes, timeout=30)
+    if returncode != 0:
+        raise RuntimeError(stderr.decode(errors='replace'))
+    return wav_bytes
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _list_analysis_files():
+    """
+    List analysis JSON files in OUTPUT_DIR (briefly cached across reruns)
+    
+    Returns:
+        list: File names ending in _analysis.json
+    """
+    if not os.path.exists(OUTPUT_DIR):
+        return []
+    return [f for f in os.listdir(OUTPUT_DIR) if f.endswith('_analysis.json')]
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _load_analysis_json(path, mtime):
+    """
+    Parse an analysis JSON file, memoized on its path and modification time
+    
+    Args:
+        path: Path to the JSON file
+        mtime: File modification time (part of the cache key only)
+        
+    Returns:
+        dict: Parsed analysis data
+    """
+    with open(path, 'rb') as f:
+        return loads_json(f.read())
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _parse_json_bytes(data):
+    """
+    Parse an uploaded analysis JSON from memory, memoized on its content
+    
+    Args:
+        data: Raw JSON bytes
+        
+    Returns:
+        dict: Parsed analysis data
+    """
+    return loads_json(data)
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _read_file_bytes(path, mtime):
+    """
+    Read an export file for download, memoized on its path and modification time
+    
+    Results-tab reruns reuse the same (immutable) bytes object instead of
+    re-reading the file from disk on every widget interaction;
+    cache_resource hands it back without the unpickling copy of cache_data.
+    
+    Args:
+        path: Path to the file
+        mtime: File modification time (part of the cache key only)
+        
+    Returns:
+        bytes: File contents
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _new_output_name(kind):
+    """
+    Build a collision-free base name for a run's output files
+    
+    The timestamp only has one-second resolution, so a short random suffix
+    keeps quick successive runs (or concurrent sessions) from overwriting
+    each other's files.
+    
+    Args:
+        kind: Name prefix, e.g. 'analysis'
+        
+    Returns:
+        tuple: (timestamp, base name such as 'analysis_20240101_120000_1a2b3c')
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return timestamp, f"{kind}_{timestamp}_{uuid.uuid4().hex[:6]}"
+
+
+def _write_json(path, data):
+    """
+    Encode data as indented JSON and write it to path
+    
+    Args:
+        path: Output file path
+        data: JSON-serializable object
+    """
+    with open(path, 'wb') as f:
+        f.write(dumps_json(data))
+
+
+@st.cache_resource(show_spinner=False)
+def _pipeline():
+    """
+    Process-wide analysis objects (stateless, so shared by all sessions)
+    
+    Figures are rendered by render_visualization in the worker processes and
+    MIDI is exported on demand, so neither is part of the pipeline.
+    
+    Returns:
+        tuple: (AudioProcessor, PitchDetector, NoteConverter)
+    """
+    from src.audio_processor import AudioProcessor
+    from src.pitch_detector import PitchDetector
+    from src.note_converter import NoteConverter
+    
+    return AudioProcessor(), PitchDetector(), NoteConverter()
+
+
+def _source_fingerprint(source, input_type):
+    """
+    Cheap cache key identifying the audio a source decodes to
+    
+    Args:
+        source: URL, file path or uploaded file object
+        input_type: 'url', 'stream' or 'file'
+        
+    Returns:
+        tuple: Hashable fingerprint (upload file_id, a BLAKE2b digest of
+            in-memory bytes, path with size and mtime, or the URL)
+    """
+    import hashlib
+    
+    if getattr(source, 'file_id', None):
+        return ('upload', source.file_id)
+    if hasattr(source, 'getbuffer'):
+        return ('bytes', hashlib.blake2b(source.getbuffer(), digest_size=16).hexdigest())
+    if input_type == 'file' and isinstance(source, str):
+        stat = os.stat(source)
+        return ('file', os.path.abspath(source), stat.st_size, stat.st_mtime_ns)
+    return (input_type, source)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _detect_pitch_cached(fingerprint, _audio_data, method):
+    """
+    Run pitch detection, memoized per source audio and method
+    
+    Re-analyzing the same audio with different post-processing or export
+    settings reuses the (expensive) CREPE/librosa/aubio pass.
+    
+    Args:
+        fingerprint: Key identifying the source audio (the cache key; the
+            audio itself is not hashed)
+        _audio_data: Normalized, trimmed audio
+        method: Pitch detection method
+        
+    Returns:
+        tuple: (times, frequencies, confidences)
+    """
+    _, pitch_detector, _ = _pipeline()
+    return pitch_detector.detect_pitch(_audio_data, method=method)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_render_pool():
+    """
+    Shared process pool for matplotlib rendering (one per server process)
+    
+    Agg rasterization holds the GIL, so figures are rendered in separate
+    processes. 'spawn' avoids forking Streamlit's threaded server.
+    
+    Returns:
+        ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers=min(8, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+# Minimum seconds between progress-only UI updates
+PROGRESS_MIN_INTERVAL = 0.05
+
+
+def _progress_ticker(progress_bar, status_text, min_interval=PROGRESS_MIN_INTERVAL):
+    """
+    Combine a progress bar and status line into one throttled update call
+    
+    Percentage-only updates arriving within min_interval of the previous one
+    are dropped; status changes and completion are always shown.
+    
+    Args:
+        progress_bar: Streamlit progress bar
+        status_text: st.empty() placeholder for the status line
+        min_interval: Minimum seconds between percentage-only updates
+        
+    Returns:
+        callable: tick(pct, msg=None)
+    """
+    state = {'last': 0.0, 'msg': None}
+    
+    def tick(pct, msg=None):
+        now = time.monotonic()
+        if msg is None and pct < 100 and now - state['last'] < min_interval:
+            return
+        state['last'] = now
+        if msg is not None and msg != state['msg']:
+            status_text.text(msg)
+            state['msg'] = msg
+        progress_bar.progress(int(pct))
+    
+    return tick
+
+
+def _render_visualizations(render_jobs, output_prefix, tick, start_pct, end_pct):
+    """
+    Render independent figures in parallel, advancing the progress bar
+    
+    Args:
+        render_jobs: List of (key, AudioVisualizer method name, args) tuples
+        output_prefix: Path prefix for saving PNGs to disk, or None to keep
+            the figures in memory only
+        tick: Progress callback from _progress_ticker
+        start_pct: Progress value before rendering
+        end_pct: Progress value once all figures are done
+        
+    Returns:
+        dict: Mapping key to PNG bytes (plots with no data are left out)
+    """
+    from src.visualizer import render_visualization
+    
+    def output_path(key):
+        return f"{output_prefix}_{key}.png" if output_prefix else None
+    
+    step = (end_pct - start_pct) / max(len(render_jobs), 1)
+    images = {}
+    
+    if (os.cpu_count() or 1) > 1:
+        try:
+            pool = _get_render_pool()
+            futures = {
+                pool.submit(render_visualization, method, args, output_path(key)): key
+                for key, method, args in render_jobs
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                images[futures[future]] = future.result()
+                tick(start_pct + done * step)
+            return {key: images[key] for key, _, _ in render_jobs if images[key]}
+        except BrokenProcessPool:
+            # A worker died; drop the pool and render in this process instead
+            _get_render_pool.clear()
+    
+    for done, (key, method, args) in enumerate(render_jobs, start=1):
+        images[key] = render_visualization(method, args, output_path(key))
+        tick(start_pct + done * step)
+    return {key: png for key, png in images.items() if png}
+
+
 def main():
     """Main application function"""
     
-    # Header with music emojis
-    st.markdown('<div class="main-header">🎵 Raga Musikraum 🎶</div>', unsafe_allow_html=True)
-    st.markdown(
-        '<div class="sub-header">✨ Transform Audio into Musical Notes | Practice Your Voice | Compare Songs ✨</div>',
-        unsafe_allow_html=True
-    )
+    # Stylesheet and header with music emojis, sent as a single element
+    st.markdown(_get_page_header(), unsafe_allow_html=True)
+    
+    # Start the first microphone enumeration now so it overlaps the other tabs
+    _get_device_lister().prefetch()
     
     # Sidebar
     with st.sidebar:
         st.header("⚙️ Settings")
         
-        # Pitch detection method
-        pitch_method = st.selectbox(
-            "Pitch Detection Method",
-            options=['crepe', 'librosa', 'aubio'],
-            help="CREPE is most accurate but slower. Librosa is faster but less accurate."
-        )
-        
-        # Post-processing options
-        st.subheader("Post-Processing")
-        smooth_pitch = st.checkbox("Smooth pitch contour", value=True)
-        remove_outliers = st.checkbox("Remove outliers", value=True)
-        
-        # Visualization options
-        st.subheader("Visualizations")
-        show_waveform = st.checkbox("Show waveform", value=True)
-        show_spectrogram = st.checkbox("Show spectrogram", value=True)
-        show_chromagram = st.checkbox("Show chromagram", value=False)
-        
-        # Export options
-        st.subheader("Export")
-        export_midi = st.checkbox("Export to MIDI", value=True)
-        export_json = st.checkbox("Export to JSON", value=True)
+        # Settings live in a form so toggling them doesn't rerun the whole
+        # script; changes are applied together on submit
+        with st.form("settings", border=False):
+            # Pitch detection method
+            pitch_method = st.selectbox(
+                "Pitch Detection Method",
+                options=['crepe', 'librosa', 'aubio'],
+                help="CREPE is most accurate but slower. Librosa is faster but less accurate."
+            )
+            
+            # Post-processing options
+            st.subheader("Post-Processing")
+            smooth_pitch = st.checkbox("Smooth pitch contour", value=True)
+            remove_outliers = st.checkbox("Remove outliers", value=True)
+            
+            # Visualization options
+            st.subheader("Visualizations")
+            show_waveform = st.checkbox("Show waveform", value=True)
+            show_spectrogram = st.checkbox("Show spectrogram", value=True)
+            show_chromagram = st.checkbox("Show chromagram", value=False)
+            
+            # Export options
+            st.subheader("Export")
+            export_midi = st.checkbox("Export to MIDI", value=True)
+            export_json = st.checkbox("Export to JSON", value=True)
+            save_figures = st.checkbox("Save figures as PNG", value=False,
+                                       help="Figures are shown from memory; also write them to outputs/")
+            st.checkbox("Celebrate finished analyses", value=False, key="celebrate",
+                        help="Show balloons when an analysis completes")
+            
+            st.form_submit_button("✅ Apply Settings")
         
         st.markdown("---")
         st.markdown("### About")
@@ -750,7 +555,9 @@ def main():
         - Note statistics
         """)
     
-    # Main content
+    # Main content - the Results, Compare and Live Mic tabs are fragments, so
+    # their own widgets only rerun that tab; the Input tab stays in the full
+    # script run because it produces the results shown elsewhere
     tab1, tab2, tab3, tab4 = st.tabs(["📥 Input", "📊 Results", "🔍 Compare Songs", "🎤 Live Mic"])
     
     with tab1:
@@ -772,6 +579,8 @@ def main():
                 placeholder="https://www.youtube.com/watch?v=..."
             )
             
+            url_is_valid = validate_url(url) if url else False
+            
             # Add streaming option for YouTube
             is_youtube = url and ('youtube.com' in url or 'youtu.be' in url)
             
@@ -786,18 +595,18 @@ def main():
                     if st.button("🔽 Download and Analyze", key="download_btn"):
                         if not url:
                             st.error("Please enter a URL")
-                        elif not validate_url(url):
+                        elif not url_is_valid:
                             st.error("Invalid URL format")
                         else:
                             analyze_audio(url, pitch_method, smooth_pitch, remove_outliers,
                                         show_waveform, show_spectrogram, show_chromagram,
-                                        export_midi, export_json, input_type='url')
+                                        export_midi, export_json, save_figures, input_type='url')
                 
                 with col2:
                     if st.button("⚡ Quick Stream Analysis", key="stream_btn", help="Analyze without downloading (faster, first 60s only)"):
                         if not url:
                             st.error("Please enter a URL")
-                        elif not validate_url(url):
+                        elif not url_is_valid:
                             st.error("Invalid URL format")
                         else:
                             # Quick accessibility check
@@ -810,17 +619,17 @@ def main():
                             else:
                                 analyze_audio(url, pitch_method, smooth_pitch, remove_outliers,
                                             show_waveform, show_spectrogram, show_chromagram,
-                                            export_midi, export_json, input_type='stream')
+                                            export_midi, export_json, save_figures, input_type='stream')
             else:
                 if st.button("🔽 Download and Analyze", key="download_btn"):
                     if not url:
                         st.error("Please enter a URL")
-                    elif not validate_url(url):
+                    elif not url_is_valid:
                         st.error("Invalid URL format")
                     else:
                         analyze_audio(url, pitch_method, smooth_pitch, remove_outliers,
                                     show_waveform, show_spectrogram, show_chromagram,
-                                    export_midi, export_json, input_type='url')
+                                    export_midi, export_json, save_figures, input_type='url')
         
         else:  # File Upload
             st.subheader("📁 Upload Audio File")
@@ -872,130 +681,85 @@ def main():
                             index=2,  # Default to 256k
                             help="MP3 output quality"
                         )
+                        
+                        save_mp3 = st.checkbox(
+                            "Save MP3 to outputs folder",
+                            value=True,
+                            help="Keep a copy in outputs/ in addition to the download"
+                        )
                     
                     # Preview/Play RAW audio
                     col1, col2 = st.columns([1, 1])
                     
+                    if FFMPEG_BIN is None:
+                        st.error("❌ FFmpeg not found. Please install FFmpeg:\n"
+                               "```\nbrew install ffmpeg\n```")
+                    
                     with col1:
-                        if st.button("▶️ Preview Audio", key="preview_raw_btn", help="Convert to temporary WAV and play"):
+                        if st.button("▶️ Preview Audio", key="preview_raw_btn", help="Convert to temporary WAV and play",
+                                     disabled=FFMPEG_BIN is None):
                             with st.spinner("Preparing audio preview..."):
                                 try:
                                     import subprocess
                                     
-                                    # Save RAW file temporarily
-                                    raw_path = os.path.join(TEMP_DIR, f"temp_preview_{raw_file.name}")
-                                    with open(raw_path, 'wb') as f:
-                                        f.write(raw_file.getbuffer())
-                                    
-                                    # Convert to WAV for preview
-                                    preview_path = os.path.join(TEMP_DIR, "preview_audio.wav")
-                                    
-                                    cmd = [
-                                        'ffmpeg',
-                                        '-f', audio_format,
-                                        '-ar', str(sample_rate),
-                                        '-ac', str(channels),
-                                        '-i', raw_path,
-                                        '-y',
-                                        preview_path
-                                    ]
-                                    
-                                    result = subprocess.run(
-                                        cmd,
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=30
+                                    wav_bytes = _decode_raw_preview(
+                                        raw_file.getvalue(), audio_format, sample_rate, channels
                                     )
-                                    
-                                    if result.returncode == 0:
-                                        st.success("✅ Audio ready to play!")
-                                        
-                                        # Play audio
-                                        with open(preview_path, 'rb') as audio_file:
-                                            audio_bytes = audio_file.read()
-                                            st.audio(audio_bytes, format='audio/wav')
-                                        
-                                        # Cleanup
-                                        if os.path.exists(raw_path):
-                                            os.remove(raw_path)
-                                        if os.path.exists(preview_path):
-                                            os.remove(preview_path)
-                                    else:
-                                        st.error(f"❌ Preview failed: {result.stderr}")
-                                        if os.path.exists(raw_path):
-                                            os.remove(raw_path)
+                                    st.success("✅ Audio ready to play!")
+                                    st.audio(wav_bytes, format='audio/wav')
                                 
+                                except RuntimeError as e:
+                                    st.error(f"❌ Preview failed: {str(e)}")
                                 except subprocess.TimeoutExpired:
                                     st.error("❌ Preview timed out")
-                                except FileNotFoundError:
-                                    st.error("❌ FFmpeg not found. Install with: brew install ffmpeg")
                                 except Exception as e:
                                     st.error(f"❌ Preview error: {str(e)}")
                     
                     with col2:
-                        if st.button("🎵 Convert to MP3", key="convert_raw_btn"):
+                        if st.button("🎵 Convert to MP3", key="convert_raw_btn", disabled=FFMPEG_BIN is None):
                             with st.spinner("Converting RAW to MP3..."):
                                 try:
                                     import subprocess
-                                    from datetime import datetime
                                     
-                                    # Save RAW file temporarily
-                                    raw_path = os.path.join(TEMP_DIR, f"temp_{raw_file.name}")
-                                    with open(raw_path, 'wb') as f:
-                                        f.write(raw_file.getbuffer())
+                                    _, output_name = _new_output_name("converted")
+                                    output_filename = f"{output_name}.mp3"
                                     
-                                    # Output MP3 path
-                                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                    output_filename = f"converted_{timestamp}.mp3"
-                                    output_path = os.path.join(OUTPUT_DIR, output_filename)
-                                    
-                                    # FFmpeg command
-                                    cmd = [
-                                        'ffmpeg',
+                                    # RAW on stdin, MP3 on stdout
+                                    returncode, mp3_bytes, stderr = _run_ffmpeg([
                                         '-f', audio_format,
                                         '-ar', str(sample_rate),
                                         '-ac', str(channels),
-                                        '-i', raw_path,
+                                        '-i', 'pipe:0',
                                         '-b:a', bitrate,
-                                        '-y',  # Overwrite output file
-                                        output_path
-                                    ]
+                                        '-f', 'mp3',
+                                        'pipe:1'
+                                    ], stdin_bytes=raw_file.getvalue(), timeout=60)
                                     
-                                    # Run FFmpeg
-                                    result = subprocess.run(
-                                        cmd,
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=60
-                                    )
-                                    
-                                    if result.returncode == 0:
+                                    if returncode == 0:
                                         st.success(f"✅ Converted successfully: {output_filename}")
                                         
-                                        # Provide download button
-                                        with open(output_path, 'rb') as f:
-                                            st.download_button(
-                                                label="📥 Download MP3",
-                                                data=f.read(),
-                                                file_name=output_filename,
-                                                mime="audio/mpeg"
-                                            )
+                                        # Provide download button straight from memory
+                                        st.download_button(
+                                            label="📥 Download MP3",
+                                            data=mp3_bytes,
+                                            file_name=output_filename,
+                                            mime="audio/mpeg"
+                                        )
                                         
-                                        st.info(f"💾 File saved to: outputs/{output_filename}")
-                                        st.info("You can now analyze this file using the 'Upload Audio File' option below!")
+                                        if save_mp3:
+                                            ensure_dirs()
+                                            output_path = os.path.join(OUTPUT_DIR, output_filename)
+                                            with open(output_path, 'wb') as f:
+                                                f.write(mp3_bytes)
+                                            
+                                            st.info(f"💾 File saved to: outputs/{output_filename}")
+                                            st.info("You can now analyze this file using the 'Upload Audio File' option below!")
                                         
                                     else:
-                                        st.error(f"❌ Conversion failed: {result.stderr}")
-                                    
-                                    # Cleanup temp file
-                                    if os.path.exists(raw_path):
-                                        os.remove(raw_path)
+                                        st.error(f"❌ Conversion failed: {stderr.decode(errors='replace')}")
                                         
                                 except subprocess.TimeoutExpired:
                                     st.error("❌ Conversion timed out (> 60 seconds)")
-                                except FileNotFoundError:
-                                    st.error("❌ FFmpeg not found. Please install FFmpeg:\n"
-                                           "```\nbrew install ffmpeg\n```")
                                 except Exception as e:
                                     st.error(f"❌ Error during conversion: {str(e)}")
             
@@ -1008,17 +772,13 @@ def main():
             )
             
             if uploaded_file is not None:
-                # Save uploaded file temporarily
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-                    tmp_file.write(uploaded_file.getvalue())
-                    audio_path = tmp_file.name
-                
-                st.success(f"✅ File uploaded: {uploaded_file.name} ({get_file_size_mb(audio_path):.2f} MB)")
+                # Decoded straight from the in-memory upload, no temp file
+                st.success(f"✅ File uploaded: {uploaded_file.name} ({uploaded_file.size / (1024 * 1024):.2f} MB)")
                 
                 if st.button("🎵 Analyze Audio", key="analyze_btn"):
-                    analyze_audio(audio_path, pitch_method, smooth_pitch, remove_outliers,
+                    analyze_audio(uploaded_file, pitch_method, smooth_pitch, remove_outliers,
                                 show_waveform, show_spectrogram, show_chromagram,
-                                export_midi, export_json, input_type='file')
+                                export_midi, export_json, save_figures, input_type='file')
     
     with tab2:
         if st.session_state.analysis_complete and st.session_state.results:
@@ -1046,12 +806,12 @@ def main():
 
 def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                   show_waveform, show_spectrogram, show_chromagram,
-                  export_midi, export_json, input_type='url'):
+                  export_midi, export_json, save_figures=False, input_type='url'):
     """
     Analyze audio and store results
     
     Args:
-        source: URL or file path
+        source: URL, file path or uploaded file object
         pitch_method: Pitch detection method
         smooth_pitch: Whether to smooth pitch
         remove_outliers: Whether to remove outliers
@@ -1060,25 +820,19 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
         show_chromagram: Whether to show chromagram
         export_midi: Whether to export MIDI
         export_json: Whether to export JSON
+        save_figures: Whether to also write the figures as PNGs to OUTPUT_DIR
         input_type: 'url' or 'file'
     """
     
     with st.spinner("🎵 Analyzing audio... This may take a minute..."):
         try:
-            # Initialize processors
-            audio_processor = AudioProcessor()
-            pitch_detector = PitchDetector()
-            note_converter = NoteConverter()
-            visualizer = AudioVisualizer()
-            midi_exporter = MidiExporter()
+            audio_processor, pitch_detector, note_converter = _pipeline()
             
             # Progress tracking
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            tick = _progress_ticker(st.progress(0), st.empty())
             
             # Step 1: Load audio
-            status_text.text("Loading audio...")
-            progress_bar.progress(10)
+            tick(10, "Loading audio...")
             
             metadata = None
             if input_type == 'stream':
@@ -1090,7 +844,11 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                     raise ValueError("Stream mode only works with YouTube URLs. Please use 'Download & Analyze' for other URLs.")
                 
                 try:
-                    audio_data, sr, metadata = audio_processor.stream_youtube_audio(source, duration_limit=60)
+                    # Reuse the info resolved by the accessibility check
+                    info = _extract_video_info(source)
+                    audio_data, sr, metadata = audio_processor.stream_youtube_audio(
+                        source, duration_limit=60, info=info
+                    )
                     audio_path = None  # No file saved
                 except ValueError:
                     # Re-raise with context
@@ -1104,7 +862,7 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                 audio_data, sr, audio_path = audio_processor.process_from_url(source)
             else:
                 audio_data, sr = audio_processor.process_from_file(source)
-                audio_path = source
+                audio_path = source if isinstance(source, str) else None
             
             # Show metadata if available
             if metadata:
@@ -1115,16 +873,15 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                 with col2:
                     st.metric("Analyzing", "First 60s")
             
-            # Normalize and trim
-            audio_data = audio_processor.normalize_audio(audio_data)
+            # Normalize (the decoded array is ours, so in place) and trim
+            audio_data = audio_processor.normalize_audio(audio_data, inplace=True)
             audio_data = audio_processor.trim_silence(audio_data)
             
             # Step 2: Detect pitch
-            status_text.text(f"Detecting pitch using {pitch_method}...")
-            progress_bar.progress(30)
+            tick(30, f"Detecting pitch using {pitch_method}...")
             
-            times, frequencies, confidences = pitch_detector.detect_pitch(
-                audio_data, method=pitch_method
+            times, frequencies, confidences = _detect_pitch_cached(
+                _source_fingerprint(source, input_type), audio_data, pitch_method
             )
             
             # Post-process
@@ -1136,105 +893,89 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                 )
             
             # Step 3: Convert to notes
-            status_text.text("Converting to musical notes...")
-            progress_bar.progress(50)
+            tick(50, "Converting to musical notes...")
             
             notes = note_converter.frequencies_to_notes(frequencies, times)
             note_segments = note_converter.get_note_segments(frequencies, times)
-            note_stats = note_converter.get_note_statistics(frequencies, times)
+            note_stats = note_converter.get_note_statistics(frequencies, times, notes=notes)
             piano_roll = note_converter.create_piano_roll_data(frequencies, times)
             
             # Step 4: Create visualizations
-            status_text.text("Creating visualizations...")
-            progress_bar.progress(70)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_prefix = os.path.join(OUTPUT_DIR, f"analysis_{timestamp}")
+            tick(70, "Creating visualizations...")
             
-            visualizations = {}
+            timestamp, output_name = _new_output_name("analysis")
+            ensure_dirs()
+            output_prefix = os.path.join(OUTPUT_DIR, output_name)
             
-            # Dashboard
-            dashboard_path = f"{output_prefix}_dashboard.png"
-            visualizer.create_summary_dashboard(
-                audio_data, sr, times, frequencies, confidences,
-                notes, note_stats, output_path=dashboard_path
-            )
-            visualizations['dashboard'] = dashboard_path
-            
-            # Pitch plot
-            pitch_path = f"{output_prefix}_pitch.png"
-            visualizer.plot_pitch_over_time(
-                times, frequencies, confidences, output_path=pitch_path
-            )
-            visualizations['pitch'] = pitch_path
-            
-            # Notes plot
-            notes_path = f"{output_prefix}_notes.png"
-            visualizer.plot_notes_over_time(notes, output_path=notes_path)
-            visualizations['notes'] = notes_path
+            exports = {}
+            export_writes = []
             
-            # Piano roll
-            piano_roll_path = f"{output_prefix}_piano_roll.png"
-            visualizer.plot_piano_roll(piano_roll, output_path=piano_roll_path)
-            visualizations['piano_roll'] = piano_roll_path
+            # Independent figures: (key, AudioVisualizer method, positional args)
+            render_jobs = [
+                ('dashboard', 'create_summary_dashboard',
+                 (audio_data, sr, times, frequencies, confidences, notes, note_stats)),
+                ('pitch', 'plot_pitch_over_time', (times, frequencies, confidences)),
+                ('notes', 'plot_notes_over_time', (notes,)),
+                ('piano_roll', 'plot_piano_roll', (piano_roll,)),
+            ]
             
             # Optional visualizations
             if show_waveform:
-                waveform_path = f"{output_prefix}_waveform.png"
-                visualizer.plot_waveform(audio_data, sr, output_path=waveform_path)
-                visualizations['waveform'] = waveform_path
-            
+                render_jobs.append(('waveform', 'plot_waveform', (audio_data, sr)))
             if show_spectrogram:
-                spec_path = f"{output_prefix}_spectrogram.png"
-                visualizer.plot_spectrogram(audio_data, sr, output_path=spec_path)
-                visualizations['spectrogram'] = spec_path
-            
+                render_jobs.append(('spectrogram', 'plot_spectrogram', (audio_data, sr)))
             if show_chromagram:
-                chroma_path = f"{output_prefix}_chromagram.png"
-                visualizer.plot_chromagram(audio_data, sr, output_path=chroma_path)
-                visualizations['chromagram'] = chroma_path
+                render_jobs.append(('chromagram', 'plot_chromagram', (audio_data, sr)))
             
             # Note distribution
-            note_dist_path = f"{output_prefix}_note_distribution.png"
-            visualizer.plot_note_distribution(note_stats, output_path=note_dist_path)
-            visualizations['note_distribution'] = note_dist_path
-            
-            # Step 5: Export
-            status_text.text("Exporting results...")
-            progress_bar.progress(90)
-            
-            exports = {}
-            
-            if export_midi:
-                midi_path = f"{output_prefix}.mid"
-                midi_exporter.create_midi_from_segments(note_segments, midi_path)
-                exports['midi'] = midi_path
+            render_jobs.append(('note_distribution', 'plot_note_distribution', (note_stats,)))
             
-            if export_json:
-                json_path = f"{output_prefix}_analysis.json"
-                json_data = {
-                    'metadata': {
-                        'timestamp': timestamp,
-                        'pitch_method': pitch_method,
-                        'sample_rate': sr,
-                        'duration': len(audio_data) / sr,
-                        'source_type': input_type,
-                        'streaming_mode': input_type == 'stream'
-                    },
-                    'statistics': note_stats,
-                    'notes': notes,
-                    'segments': note_segments
-                }
-                if metadata:
-                    json_data['metadata']['video_info'] = metadata
+            # MIDI/JSON exports are encoded and written on a background thread
+            # while the figures render
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix='export-writer') as export_writer:
+                if export_midi:
+                    from src.midi_exporter import MidiExporter
+                    
+                    midi_exporter = MidiExporter()
+                    midi_path = f"{output_prefix}.mid"
+                    export_writes.append(export_writer.submit(
+                        midi_exporter.create_midi_from_segments, note_segments, midi_path
+                    ))
+                    exports['midi'] = midi_path
+                
+                if export_json:
+                    json_path = f"{output_prefix}_analysis.json"
+                    json_data = {
+                        'metadata': {
+                            'timestamp': timestamp,
+                            'pitch_method': pitch_method,
+                            'sample_rate': sr,
+                            'duration': len(audio_data) / sr,
+                            'source_type': input_type,
+                            'streaming_mode': input_type == 'stream'
+                        },
+                        'statistics': note_stats,
+                        'notes': notes,
+                        'segments': note_segments
+                    }
+                    if metadata:
+                        json_data['metadata']['video_info'] = metadata
+                    
+                    export_writes.append(export_writer.submit(_write_json, json_path, json_data))
+                    exports['json'] = json_path
+                
+                visualizations = _render_visualizations(
+                    render_jobs, output_prefix if save_figures else None, tick, 70, 90
+                )
                 
-                with open(json_path, 'w') as f:
-                    json.dump(json_data, f, indent=2)
-                exports['json'] = json_path
+                # Step 5: Export
+                tick(90, "Exporting results...")
+                
+                for future in export_writes:
+                    future.result()
             
             # Complete
-            progress_bar.progress(100)
-            status_text.text("✅ Analysis complete!")
+            tick(100, "✅ Analysis complete!")
             
             # Store results
             st.session_state.results = {
@@ -1254,7 +995,8 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
             st.session_state.analysis_complete = True
             
             st.success("🎉 Analysis completed successfully! Check the Results tab.")
-            st.balloons()
+            if st.session_state.get('celebrate', False):
+                st.balloons()
             
         except ValueError as e:
             # Handle streaming errors with helpful message
@@ -1286,7 +1028,7 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                 if st.button("🔄 Retry with Download Mode", key="retry_download"):
                     analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
                                 show_waveform, show_spectrogram, show_chromagram,
-                                export_midi, export_json, input_type='url')
+                                export_midi, export_json, save_figures, input_type='url')
             else:
                 # Show debug info expander
                 with st.expander("🐛 Debug Information"):
@@ -1308,6 +1050,7 @@ def analyze_audio(source, pitch_method, smooth_pitch, remove_outliers,
             """)
 
 
+@st.fragment
 def display_results(results):
     """
     Display analysis results
@@ -1394,26 +1137,74 @@ def display_results(results):
         
         for i, (export_type, export_path) in enumerate(results['exports'].items()):
             with cols[i]:
-                with open(export_path, 'rb') as f:
-                    btn_label = f"Download {export_type.upper()}"
-                    st.download_button(
-                        label=btn_label,
-                        data=f,
-                        file_name=os.path.basename(export_path),
-                        mime='application/octet-stream'
-                    )
+                btn_label = f"Download {export_type.upper()}"
+                st.download_button(
+                    label=btn_label,
+                    data=_read_file_bytes(export_path, os.path.getmtime(export_path)),
+                    file_name=os.path.basename(export_path),
+                    mime='application/octet-stream'
+                )
     
     # Raw data
     with st.expander("🔍 View Raw Data"):
+        frequencies = np.asarray(results['frequencies'])
+        detected = int(np.count_nonzero(frequencies > 0))
         st.json({
             'total_frames': len(results['times']),
-            'detected_pitches': len([f for f in results['frequencies'] if f > 0]),
-            'pitch_coverage': f"{len([f for f in results['frequencies'] if f > 0]) / len(results['frequencies']) * 100:.1f}%",
+            'detected_pitches': detected,
+            'pitch_coverage': f"{safe_divide(detected, frequencies.size) * 100:.1f}%",
             'method': results['pitch_method']
         })
 
 
 
+# Column display formats for the matched-notes sample (applied per column)
+MATCH_SAMPLE_FORMATS = {
+    'Original Time': '{:.2f}s',
+    'Your Time': '{:.2f}s',
+    'Time Diff': '{:.3f}s',
+    'Freq Diff': '{:.1f}Hz',
+}
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _match_sample_df(rows):
+    """
+    Build the matched-notes sample table, memoized on its rows
+    
+    Values stay numeric; units are added by MATCH_SAMPLE_FORMATS when the
+    table is styled.
+    
+    Args:
+        rows: Tuple of (note, original time, your time, time diff, freq diff)
+        
+    Returns:
+        pandas.DataFrame
+    """
+    import pandas as pd
+    
+    return pd.DataFrame(
+        rows, columns=['Note', 'Original Time', 'Your Time', 'Time Diff', 'Freq Diff']
+    )
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _missing_notes_df(rows):
+    """
+    Build the missing-notes table, memoized on its rows
+    
+    Args:
+        rows: Tuple of (note, time in seconds)
+        
+    Returns:
+        pandas.DataFrame
+    """
+    import pandas as pd
+    
+    return pd.DataFrame(rows, columns=['Note', 'Time (s)'])
+
+
+@st.fragment
 def display_comparison_tab():
     """Display the song comparison interface"""
     st.header("🔍 Compare Two Songs")
@@ -1434,9 +1225,7 @@ def display_comparison_tab():
         st.subheader("📄 Original Song")
         
         # Option to select from analyzed files
-        output_files = []
-        if os.path.exists(OUTPUT_DIR):
-            output_files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('_analysis.json')]
+        output_files = _list_analysis_files()
         
         original_method = st.radio(
             "Select original song:",
@@ -1445,6 +1234,7 @@ def display_comparison_tab():
         )
         
         original_json = None
+        orig_data = None
         if original_method == "From analyzed files":
             if output_files:
                 selected_original = st.selectbox(
@@ -1463,17 +1253,20 @@ def display_comparison_tab():
                 key="original_upload"
             )
             if uploaded_original:
-                # Save temporarily
-                original_json = os.path.join(TEMP_DIR, "original_temp.json")
-                with open(original_json, 'wb') as f:
-                    f.write(uploaded_original.getbuffer())
+                # Parsed straight from the upload, nothing written to disk
+                original_json = uploaded_original.name
+                try:
+                    orig_data = _parse_json_bytes(uploaded_original.getvalue())
+                except ValueError as e:
+                    st.error(f"❌ Invalid JSON file: {str(e)}")
+        
+        if orig_data is None and original_json and os.path.exists(original_json):
+            orig_data = _load_analysis_json(original_json, os.path.getmtime(original_json))
         
-        if original_json and os.path.exists(original_json):
+        if orig_data is not None:
             st.success(f"✅ Original loaded: {os.path.basename(original_json)}")
             # Show preview
-            with open(original_json, 'r') as f:
-                orig_data = json.load(f)
-                st.info(f"📊 Notes: {len(orig_data.get('notes', []))}")
+            st.info(f"📊 Notes: {len(orig_data.get('notes', []))}")
     
     with col2:
         st.subheader("🎤 Your Song")
@@ -1485,6 +1278,7 @@ def display_comparison_tab():
         )
         
         comparison_json = None
+        comp_data = None
         if comparison_method == "From analyzed files":
             if output_files:
                 selected_comparison = st.selectbox(
@@ -1503,17 +1297,20 @@ def display_comparison_tab():
                 key="comparison_upload"
             )
             if uploaded_comparison:
-                # Save temporarily
-                comparison_json = os.path.join(TEMP_DIR, "comparison_temp.json")
-                with open(comparison_json, 'wb') as f:
-                    f.write(uploaded_comparison.getbuffer())
+                # Parsed straight from the upload, nothing written to disk
+                comparison_json = uploaded_comparison.name
+                try:
+                    comp_data = _parse_json_bytes(uploaded_comparison.getvalue())
+                except ValueError as e:
+                    st.error(f"❌ Invalid JSON file: {str(e)}")
         
-        if comparison_json and os.path.exists(comparison_json):
+        if comp_data is None and comparison_json and os.path.exists(comparison_json):
+            comp_data = _load_analysis_json(comparison_json, os.path.getmtime(comparison_json))
+        
+        if comp_data is not None:
             st.success(f"✅ Your song loaded: {os.path.basename(comparison_json)}")
             # Show preview
-            with open(comparison_json, 'r') as f:
-                comp_data = json.load(f)
-                st.info(f"📊 Notes: {len(comp_data.get('notes', []))}")
+            st.info(f"📊 Notes: {len(comp_data.get('notes', []))}")
     
     # Comparison settings
     st.markdown("---")
@@ -1531,16 +1328,21 @@ def display_comparison_tab():
     if st.button("🔍 Compare Songs", key="compare_btn"):
         if not original_json or not comparison_json:
             st.error("❌ Please select both songs to compare")
-        elif not os.path.exists(original_json) or not os.path.exists(comparison_json):
+        elif orig_data is None or comp_data is None:
             st.error("❌ One or both JSON files not found")
         else:
             with st.spinner("Analyzing similarities..."):
                 try:
+                    from src.song_comparator import SongComparator
+                    
                     # Create comparator
                     comparator = SongComparator(time_tolerance=time_tolerance)
                     
-                    # Compare songs
-                    comparison_results = comparator.compare_songs(original_json, comparison_json)
+                    # Compare songs (reusing the already-parsed JSON)
+                    comparison_results = comparator.compare_songs(
+                        original_json, comparison_json,
+                        original_data=orig_data, comparison_data=comp_data
+                    )
                     
                     # Display results
                     st.success("✅ Comparison complete!")
@@ -1605,22 +1407,28 @@ def display_comparison_tab():
                         
                         st.markdown("### Matched Notes Sample")
                         if match['matching_notes']:
-                            match_data = []
-                            for m in match['matching_notes'][:20]:
-                                match_data.append({
-                                    'Note': m['note'],
-                                    'Original Time': f"{m['original_time']:.2f}s",
-                                    'Your Time': f"{m['comparison_time']:.2f}s",
-                                    'Time Diff': f"{m['time_difference']:.3f}s",
-                                    'Freq Diff': f"{m['frequency_difference_hz']:.1f}Hz"
-                                })
-                            st.dataframe(match_data, use_container_width=True)
+                            match_rows = tuple(
+                                (m['note'], m['original_time'], m['comparison_time'],
+                                 m['time_difference'], m['frequency_difference_hz'])
+                                for m in match['matching_notes'][:20]
+                            )
+                            st.dataframe(
+                                _match_sample_df(match_rows).style.format(MATCH_SAMPLE_FORMATS),
+                                use_container_width=True
+                            )
                         
                         if match['unmatched_in_original']:
                             st.markdown("### Missing Notes Details")
                             with st.expander("Show missing notes"):
-                                for note in match['unmatched_in_original'][:20]:
-                                    st.text(f"❌ {note['note']} @ {note['time']:.2f}s")
+                                missing_rows = tuple(
+                                    (n['note'], round(n['time'], 2))
+                                    for n in match['unmatched_in_original'][:20]
+                                )
+                                st.dataframe(
+                                    _missing_notes_df(missing_rows),
+                                    use_container_width=True,
+                                    hide_index=True
+                                )
                     
                     with tab_timing:
                         timing = comparison_results['timing_analysis']
@@ -1659,7 +1467,7 @@ def display_comparison_tab():
                     with col2:
                         st.download_button(
                             label="📥 Download JSON Report",
-                            data=json.dumps(comparison_results, indent=2),
+                            data=dumps_json(comparison_results),
                             file_name=f"comparison_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                             mime="application/json"
                         )
@@ -1674,9 +1482,216 @@ def display_comparison_tab():
                     st.code(traceback.format_exc())
 
 
+@st.cache_resource(show_spinner=False)
+def _get_recorder():
+    """
+    Shared MicrophoneRecorder (the app only uses its stateless helpers)
+    
+    Returns:
+        MicrophoneRecorder
+    """
+    from src.microphone_input import MicrophoneRecorder
+    
+    return MicrophoneRecorder()
+
+
+DEVICE_LIST_WAIT = 2.0
+
+
+class _DeviceLister:
+    """
+    Enumerates input devices on a background thread
+    
+    PortAudio can block for seconds while it initializes (e.g. right after a
+    permission prompt), so the query runs off the script thread and is
+    started as early as possible. Results are not cached here: repeat
+    queries are served by the recorder's device cache (DEVICE_CACHE_TTL in
+    src.microphone_input) until it expires or refresh() clears it.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='device-lister')
+        self._future = None
+    
+    @staticmethod
+    def _list_devices(refresh=False):
+        from src.microphone_input import refresh_devices
+        
+        if refresh:
+            refresh_devices()
+        recorder = _get_recorder()
+        return recorder.list_devices(), recorder.get_default_device()
+    
+    def start(self, refresh=False):
+        """
+        Start a device query unless one is already running (a refresh
+        is always queued, behind any running query)
+        
+        Args:
+            refresh: Drop the cached device lists so PortAudio is asked again
+                (e.g. after a microphone was plugged in)
+            
+        Returns:
+            concurrent.futures.Future resolving to (devices, default device)
+        """
+        with self._lock:
+            if refresh or self._future is None or self._future.done():
+                self._future = self._executor.submit(self._list_devices, refresh)
+            return self._future
+    
+    def prefetch(self):
+        """
+        Start the first device query if none has been made yet
+        
+        Later reruns leave it alone, so pages that never show the
+        microphone tab don't keep PortAudio busy.
+        """
+        with self._lock:
+            if self._future is None:
+                self._future = self._executor.submit(self._list_devices, False)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_device_lister():
+    """Process-wide background device lister (shared by all sessions)"""
+    return _DeviceLister()
+
+
+def _get_recording_buffer(n_samples):
+    """
+    Reusable per-session float32 buffer for microphone recordings
+    
+    The buffer only grows, so repeated recordings reuse the same memory.
+    It is zero-filled before use so every page is already faulted in
+    before the real-time audio callback starts writing to it.
+    
+    Args:
+        n_samples: Number of samples needed
+        
+    Returns:
+        np.ndarray: (n_samples, 1) float32 view into the session buffer
+    """
+    buffer = st.session_state.get('mic_record_buffer')
+    if buffer is None or buffer.shape[0] < n_samples:
+        buffer = np.empty((n_samples, 1), dtype=np.float32)
+        st.session_state.mic_record_buffer = buffer
+    buffer = buffer[:n_samples]
+    buffer.fill(0)
+    return buffer
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _recording_wav_bytes(recording_id, _audio, sample_rate):
+    """
+    Encode a microphone recording as a 16-bit WAV, once per recording
+    
+    Args:
+        recording_id: Unique id of the recording (the cache key; the audio
+            itself is not hashed)
+        _audio: Recorded samples
+        sample_rate: Sample rate of the recording
+        
+    Returns:
+        bytes: WAV file contents
+    """
+    import io
+    import soundfile as sf
+    
+    buffer = io.BytesIO()
+    sf.write(buffer, _audio, sample_rate, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+# Fewer voiced pitch frames than this is treated as "no clear notes"
+MIC_MIN_VOICED_FRAMES = 10
+
+
+@st.cache_data(ttl=600, max_entries=8, show_spinner=False)
+def _analyze_recording(recording_id, _audio_data, method, smooth, remove_outliers):
+    """
+    Run the pitch/note pipeline on a microphone recording, memoized per
+    recording and analysis settings
+    
+    Args:
+        recording_id: Unique id of the recording (the cache key; the audio
+            itself is not hashed)
+        _audio_data: Normalized, trimmed recording
+        method: Pitch detection method
+        smooth: Whether to smooth pitch
+        remove_outliers: Whether to remove outliers
+        
+    Returns:
+        tuple: (times, frequencies, confidences, notes, note_stats, note_segments);
+            stats and segments are None when no notes were detected
+    """
+    _, pitch_detector, note_converter = _pipeline()
+    
+    times, frequencies, confidences = pitch_detector.detect_pitch(_audio_data, method=method)
+    
+    if smooth or remove_outliers:
+        frequencies = pitch_detector.post_process_pitch(
+            frequencies, confidences,
+            smooth=smooth,
+            remove_outliers_flag=remove_outliers
+        )
+    
+    # Silent or very short takes: skip the per-frame note passes entirely
+    if np.count_nonzero(frequencies > 0) < MIC_MIN_VOICED_FRAMES:
+        return times, frequencies, confidences, [], None, None
+    
+    notes = note_converter.frequencies_to_notes(frequencies, times)
+    if not notes:
+        return times, frequencies, confidences, notes, None, None
+    
+    note_stats = note_converter.get_note_statistics(frequencies, times, notes=notes)
+    note_segments = note_converter.get_note_segments(frequencies, times)
+    return times, frequencies, confidences, notes, note_stats, note_segments
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _render_png_cached(fingerprint, method_name, _args):
+    """
+    Render an AudioVisualizer plot to PNG bytes, memoized on a fingerprint
+    
+    Args:
+        fingerprint: Hashable key that identifies the plotted data (the
+            data itself is not hashed)
+        method_name: Name of the AudioVisualizer plotting method
+        _args: Positional arguments for the method
+        
+    Returns:
+        bytes: PNG image
+    """
+    from src.visualizer import render_visualization
+    
+    return render_visualization(method_name, _args)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _segments_midi_bytes(fingerprint, _note_segments):
+    """
+    Build the MIDI file for a recording's note segments in memory
+    
+    Args:
+        fingerprint: Hashable key that identifies the segments (they are
+            not hashed themselves)
+        _note_segments: Note segments from NoteConverter.get_note_segments
+        
+    Returns:
+        bytes: Standard MIDI file
+    """
+    import io
+    from src.midi_exporter import MidiExporter
+    
+    buffer = io.BytesIO()
+    MidiExporter().create_midi_from_segments(_note_segments, buffer)
+    return buffer.getvalue()
+
+
+@st.fragment
 def display_microphone_tab():
     """Display the live microphone recording interface"""
-    from src.microphone_input import MicrophoneRecorder
     
     st.header("🎤 Live Microphone Analysis")
     st.markdown("""
@@ -1685,10 +1700,8 @@ def display_microphone_tab():
     """)
     
     # Initialize session state for microphone
-    if 'mic_recorded_audio' not in st.session_state:
-        st.session_state.mic_recorded_audio = None
-    if 'mic_sample_rate' not in st.session_state:
-        st.session_state.mic_sample_rate = None
+    for key in ('mic_recorded_audio', 'mic_sample_rate', 'mic_recording_id'):
+        st.session_state.setdefault(key, None)
     
     # Microphone settings
     col1, col2 = st.columns(2)
@@ -1696,14 +1709,15 @@ def display_microphone_tab():
     with col1:
         st.subheader("⚙️ Recording Settings")
         
-        # Get available devices
+        # Get available devices (re-enumerated on demand for hot-plugged mics)
+        refresh = st.button("🔄 Refresh devices", help="Look for newly connected microphones")
+        devices_future = _get_device_lister().start(refresh=refresh)
         try:
-            recorder = MicrophoneRecorder()
-            devices = recorder.list_devices()
-            default_device = recorder.get_default_device()
+            devices, default_device = devices_future.result(timeout=DEVICE_LIST_WAIT)
             
             if devices:
-                device_names = [f"{d['name']} ({d['index']})" for d in devices]
+                name_to_idx = {f"{d['name']} ({d['index']})": d['index'] for d in devices}
+                device_names = list(name_to_idx)
                 default_idx = 0
                 
                 if default_device:
@@ -1719,13 +1733,16 @@ def display_microphone_tab():
                 )
                 
                 # Extract device index from selection
-                selected_device_idx = devices[[d['name'] in selected_device_name for d in devices].index(True)]['index']
+                selected_device_idx = name_to_idx[selected_device_name]
                 
                 st.success(f"✅ Using: {selected_device_name}")
             else:
                 st.error("❌ No microphone devices found!")
                 selected_device_idx = None
                 
+        except FuturesTimeoutError:
+            st.info("🔍 Still detecting microphones... rerun the page in a moment.")
+            selected_device_idx = None
         except Exception as e:
             st.error(f"❌ Error detecting microphones: {str(e)}")
             selected_device_idx = None
@@ -1744,8 +1761,7 @@ def display_microphone_tab():
             if selected_device_idx is not None:
                 with st.spinner("Testing microphone..."):
                     try:
-                        test_recorder = MicrophoneRecorder()
-                        is_working = test_recorder.test_microphone(duration=2.0)
+                        is_working = _get_recorder().test_microphone(duration=2.0)
                         
                         if is_working:
                             st.success("✅ Microphone is working! You can start recording.")
@@ -1769,6 +1785,8 @@ def display_microphone_tab():
         
         mic_smooth = st.checkbox("Smooth pitch", value=True, key="mic_smooth")
         mic_remove_outliers = st.checkbox("Remove outliers", value=True, key="mic_outliers")
+        mic_save_figures = st.checkbox("Save figures as PNG", value=False, key="mic_save_figures",
+                                       help="Figures are shown from memory; also write them to outputs/")
         
         st.info("💡 **Tip:** Sing clearly into the mic for best results!")
     
@@ -1783,44 +1801,65 @@ def display_microphone_tab():
             if selected_device_idx is not None:
                 with st.spinner(f"Recording for {recording_duration} seconds... 🎤"):
                     try:
-                        mic_recorder = MicrophoneRecorder()
+                        mic_recorder = _get_recorder()
                         
                         # Show countdown
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
-                        # Record with progress updates
+                        # Record through a callback into a preallocated buffer,
+                        # polling the fill level for progress updates
                         import sounddevice as sd
-                        audio_data = sd.rec(
-                            int(recording_duration * mic_recorder.sample_rate),
-                            samplerate=mic_recorder.sample_rate,
-                            channels=1,
-                            device=selected_device_idx,
-                            dtype='float32'
-                        )
+                        sr = mic_recorder.sample_rate
+                        n_samples = int(recording_duration * sr)
+                        recording = _get_recording_buffer(n_samples)
+                        filled = [0]
                         
-                        # Show progress
-                        for i in range(recording_duration):
-                            progress_bar.progress((i + 1) / recording_duration)
-                            status_text.text(f"Recording... {i + 1}/{recording_duration} seconds")
-                            time.sleep(1)
+                        def on_audio(indata, frames, time_info, status):
+                            n = min(frames, n_samples - filled[0])
+                            recording[filled[0]:filled[0] + n] = indata[:n]
+                            filled[0] += n
+                            if filled[0] >= n_samples:
+                                raise sd.CallbackStop()
                         
-                        sd.wait()
+                        deadline = time.monotonic() + recording_duration + 5
+                        with sd.InputStream(samplerate=sr, channels=1,
+                                            device=selected_device_idx, dtype='float32',
+                                            callback=on_audio, blocksize=1024):
+                            while filled[0] < n_samples:
+                                if time.monotonic() > deadline:
+                                    raise RuntimeError("Microphone stopped delivering audio")
+                                progress_bar.progress(filled[0] / n_samples)
+                                status_text.text(f"Recording... {filled[0] / sr:.1f}/{recording_duration} seconds")
+                                time.sleep(PROGRESS_MIN_INTERVAL)
                         
-                        audio_data = audio_data.flatten()
+                        # View into the session buffer; no copy for the mono channel
+                        audio_data = recording.reshape(-1)
                         
                         progress_bar.progress(100)
                         status_text.text("✅ Recording complete!")
                         
+                        # Normalize and trim once here instead of on every Analyze click
+                        audio_processor, _, _ = _pipeline()
+                        
+                        processed = audio_processor.trim_silence(
+                            audio_processor.normalize_audio(audio_data)
+                        )
+                        # Normalize/trim can hand back the input untouched; the
+                        # stored take must not alias the buffer the next recording reuses
+                        if np.may_share_memory(processed, recording):
+                            processed = processed.copy()
+                        
                         # Store in session state
-                        st.session_state.mic_recorded_audio = audio_data
+                        st.session_state.mic_recorded_audio = processed
                         st.session_state.mic_sample_rate = mic_recorder.sample_rate
+                        st.session_state.mic_recording_id = uuid.uuid4().hex
                         
                         # Show audio info
                         st.success(f"✅ Recorded {len(audio_data) / mic_recorder.sample_rate:.1f} seconds")
                         
                         # Show audio level
-                        rms = np.sqrt(np.mean(audio_data ** 2))
+                        rms = mic_recorder.get_audio_level(audio_data)
                         st.metric("Audio Level", f"{rms:.4f}")
                         
                         if rms < 0.001:
@@ -1837,9 +1876,13 @@ def display_microphone_tab():
         if st.session_state.mic_recorded_audio is not None:
             st.download_button(
                 label="💾 Save Recording",
-                data=st.session_state.mic_recorded_audio.tobytes(),
-                file_name=f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}.raw",
-                mime="application/octet-stream",
+                data=_recording_wav_bytes(
+                    st.session_state.mic_recording_id,
+                    st.session_state.mic_recorded_audio,
+                    st.session_state.mic_sample_rate
+                ),
+                file_name=f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav",
+                mime="audio/wav",
                 use_container_width=True
             )
     
@@ -1849,45 +1892,26 @@ def display_microphone_tab():
                 # Analyze the recorded audio
                 audio_data = st.session_state.mic_recorded_audio
                 sr = st.session_state.mic_sample_rate
+                if audio_data.dtype == np.int16:
+                    # Compacted after a previous analysis; decode back to float
+                    audio_data = audio_data.astype(np.float32) / 32767
                 
                 with st.spinner("Analyzing your voice... 🎵"):
                     try:
-                        # Use the same analysis pipeline
-                        audio_processor = AudioProcessor()
-                        pitch_detector = PitchDetector()
-                        note_converter = NoteConverter()
-                        visualizer = AudioVisualizer()
-                        
-                        # Normalize audio
-                        audio_data = audio_processor.normalize_audio(audio_data)
-                        audio_data = audio_processor.trim_silence(audio_data)
-                        
+                        # The stored recording is already normalized and trimmed
                         if len(audio_data) == 0:
                             st.error("❌ No audio detected after silence removal. Please record again and speak/sing louder.")
                             return
                         
-                        # Detect pitch
-                        times, frequencies, confidences = pitch_detector.detect_pitch(
-                            audio_data, method=mic_pitch_method
+                        times, frequencies, confidences, notes, note_stats, note_segments = _analyze_recording(
+                            st.session_state.mic_recording_id, audio_data,
+                            mic_pitch_method, mic_smooth, mic_remove_outliers
                         )
                         
-                        # Post-process
-                        if mic_smooth or mic_remove_outliers:
-                            frequencies = pitch_detector.post_process_pitch(
-                                frequencies, confidences,
-                                smooth=mic_smooth,
-                                remove_outliers_flag=mic_remove_outliers
-                            )
-                        
-                        # Convert to notes
-                        notes = note_converter.frequencies_to_notes(frequencies, times)
-                        
                         if not notes:
                             st.warning("⚠️ No clear notes detected. Try singing louder or clearer.")
                             return
                         
-                        note_stats = note_converter.get_note_statistics(frequencies, times)
-                        
                         # Display results in real-time
                         st.success(f"✅ Detected {len(notes)} notes!")
                         
@@ -1913,26 +1937,33 @@ def display_microphone_tab():
                         # Visualize notes over time
                         st.subheader("📈 Your Notes Over Time")
                         
-                        # Create visualization
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        output_prefix = os.path.join(OUTPUT_DIR, f"mic_recording_{timestamp}")
+                        # Create visualization (re-analyzing the same recording
+                        # with the same settings reuses the rendered figures)
+                        timestamp, output_name = _new_output_name("mic_recording")
+                        ensure_dirs()
+                        output_prefix = os.path.join(OUTPUT_DIR, output_name)
+                        fingerprint = (st.session_state.mic_recording_id, mic_pitch_method,
+                                       mic_smooth, mic_remove_outliers)
                         
-                        notes_path = f"{output_prefix}_notes.png"
-                        visualizer.plot_notes_over_time(notes, output_path=notes_path)
-                        st.image(notes_path, use_container_width=True)
+                        notes_png = _render_png_cached(fingerprint, 'plot_notes_over_time', (notes,))
+                        st.image(notes_png, use_container_width=True)
                         
                         # Show pitch plot
-                        pitch_path = f"{output_prefix}_pitch.png"
-                        visualizer.plot_pitch_over_time(
-                            times, frequencies, confidences, output_path=pitch_path
+                        pitch_png = _render_png_cached(
+                            fingerprint, 'plot_pitch_over_time', (times, frequencies, confidences)
                         )
-                        st.image(pitch_path, use_container_width=True)
+                        st.image(pitch_png, use_container_width=True)
                         
                         # Show note distribution
                         st.subheader("📊 Note Distribution")
-                        dist_path = f"{output_prefix}_distribution.png"
-                        visualizer.plot_note_distribution(note_stats, output_path=dist_path)
-                        st.image(dist_path, use_container_width=True)
+                        dist_png = _render_png_cached(fingerprint, 'plot_note_distribution', (note_stats,))
+                        st.image(dist_png, use_container_width=True)
+                        
+                        if mic_save_figures:
+                            for suffix, png in (('notes', notes_png), ('pitch', pitch_png),
+                                                ('distribution', dist_png)):
+                                with open(f"{output_prefix}_{suffix}.png", 'wb') as f:
+                                    f.write(png)
                         
                         # Export options
                         st.markdown("---")
@@ -1941,19 +1972,19 @@ def display_microphone_tab():
                         col1, col2 = st.columns(2)
                         
                         with col1:
-                            # Export MIDI
-                            note_segments = note_converter.get_note_segments(frequencies, times)
-                            midi_exporter = MidiExporter()
+                            # Export MIDI; built in memory so the same bytes go
+                            # to disk and the download without a re-read
                             midi_path = f"{output_prefix}.mid"
-                            midi_exporter.create_midi_from_segments(note_segments, midi_path)
+                            midi_bytes = _segments_midi_bytes(fingerprint, note_segments)
+                            with open(midi_path, 'wb') as f:
+                                f.write(midi_bytes)
                             
-                            with open(midi_path, 'rb') as f:
-                                st.download_button(
-                                    label="🎹 Download MIDI",
-                                    data=f,
-                                    file_name=os.path.basename(midi_path),
-                                    mime="audio/midi"
-                                )
+                            st.download_button(
+                                label="🎹 Download MIDI",
+                                data=midi_bytes,
+                                file_name=os.path.basename(midi_path),
+                                mime="audio/midi"
+                            )
                         
                         with col2:
                             # Export JSON
@@ -1970,18 +2001,27 @@ def display_microphone_tab():
                                 'segments': note_segments
                             }
                             
-                            with open(json_path, 'w') as f:
-                                json.dump(json_data, f, indent=2)
+                            # Serialize once; the same bytes go to disk and the download
+                            json_bytes = dumps_json(json_data)
+                            with open(json_path, 'wb') as f:
+                                f.write(json_bytes)
                             
-                            with open(json_path, 'rb') as f:
-                                st.download_button(
-                                    label="📄 Download JSON",
-                                    data=f,
-                                    file_name=os.path.basename(json_path),
-                                    mime="application/json"
-                                )
+                            st.download_button(
+                                label="📄 Download JSON",
+                                data=json_bytes,
+                                file_name=os.path.basename(json_path),
+                                mime="application/json"
+                            )
+                        
+                        # Exports are done: keep the recording as 16-bit PCM to
+                        # cut its per-session memory to a quarter
+                        if st.session_state.mic_recorded_audio.dtype != np.int16:
+                            st.session_state.mic_recorded_audio = (
+                                np.clip(audio_data, -1.0, 1.0) * 32767
+                            ).astype(np.int16)
                         
-                        st.balloons()
+                        if st.session_state.get('celebrate', False):
+                            st.balloons()
                         
                     except Exception as e:
                         st.error(f"❌ Analysis failed: {str(e)}")
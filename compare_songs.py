@@ -6,12 +6,20 @@ Command-line tool for comparing two analyzed songs
 import sys
 import os
 import argparse
-import json
+from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.song_comparator import SongComparator
+from src.utils import dumps_json
+
+
+def _existing_path(path):
+    """argparse type: accept only paths to existing files"""
+    if not os.path.exists(path):
+        raise argparse.ArgumentTypeError(f"file not found: {path}")
+    return path
 
 
 def main():
@@ -36,11 +44,13 @@ Examples:
     
     parser.add_argument(
         'original',
+        type=_existing_path,
         help='Path to original song JSON analysis file'
     )
     
     parser.add_argument(
         'comparison',
+        type=_existing_path,
         help='Path to your song JSON analysis file'
     )
     
@@ -63,15 +73,6 @@ Examples:
     
     args = parser.parse_args()
     
-    # Validate files exist
-    if not os.path.exists(args.original):
-        print(f"❌ Error: Original file not found: {args.original}")
-        sys.exit(1)
-    
-    if not os.path.exists(args.comparison):
-        print(f"❌ Error: Comparison file not found: {args.comparison}")
-        sys.exit(1)
-    
     print("🔍 Starting song comparison...")
     print(f"   Original: {args.original}")
     print(f"   Your song: {args.comparison}")
@@ -89,18 +90,18 @@ Examples:
         report = comparator.generate_comparison_report(results)
         
         # Print report
-        print(report)
+        sys.stdout.write(report)
+        sys.stdout.write("\n")
         
-        # Save to file if requested
+        # Save to file if requested (same string, no second formatting pass)
         if args.output:
-            with open(args.output, 'w') as f:
-                f.write(report)
+            Path(args.output).write_text(report)
             print(f"\n✅ Text report saved to: {args.output}")
         
         # Save JSON if requested
         if args.json:
-            with open(args.json, 'w') as f:
-                json.dump(results, f, indent=2)
+            with open(args.json, 'wb') as f:
+                f.write(dumps_json(results))
             print(f"✅ JSON results saved to: {args.json}")
         
         # Exit with success
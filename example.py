@@ -5,6 +5,7 @@ Demonstrates basic usage of the Music Analyzer
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
 # Add src to path
@@ -13,9 +14,46 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.audio_processor import AudioProcessor
 from src.pitch_detector import PitchDetector
 from src.note_converter import NoteConverter
-from src.visualizer import AudioVisualizer
+from src.visualizer import render_visualization
 from src.midi_exporter import MidiExporter
-from src.config import OUTPUT_DIR
+from src.config import OUTPUT_DIR, TEMP_DIR, ensure_dirs
+from src.utils import NUMBA_AVAILABLE, dumps_json
+
+# C4, D4, E4, F4, G4, A4, B4, C5
+_C_MAJOR_HZ = np.array([261.63, 293.66, 329.63, 349.23, 392.00, 440.00, 493.88, 523.25],
+                       dtype=np.float32)
+_C_MAJOR_HZ.flags.writeable = False
+
+if NUMBA_AVAILABLE:
+    from numba import njit
+    
+    @njit(cache=True, fastmath=True)
+    def _synth_scale_jit(freqs, sample_rate, n_samples, duration_per_note):
+        """
+        JIT scale synthesis without per-sample sin/exp calls
+        
+        Each harmonic follows sin((n+1)w) = 2cos(w)sin(nw) - sin((n-1)w) and
+        the envelope is a running product, so a sample costs a few
+        multiply-adds.
+        """
+        out = np.empty(len(freqs) * n_samples, dtype=np.float32)
+        decay = np.exp(-2.0 / (sample_rate * duration_per_note))
+        for k in range(len(freqs)):
+            w = 2.0 * np.pi * freqs[k] / sample_rate
+            c1, c2, c3 = 2.0 * np.cos(w), 2.0 * np.cos(2 * w), 2.0 * np.cos(3 * w)
+            # sin(0) and sin(-w) for each harmonic
+            a0, a1 = 0.0, -np.sin(w)
+            b0, b1 = 0.0, -np.sin(2 * w)
+            d0, d1 = 0.0, -np.sin(3 * w)
+            env = 1.0
+            base = k * n_samples
+            for i in range(n_samples):
+                out[base + i] = (a0 + 0.3 * b0 + 0.1 * d0) * env
+                a0, a1 = c1 * a0 - a1, a0
+                b0, b1 = c2 * b0 - b1, b0
+                d0, d1 = c3 * d0 - d1, d0
+                env *= decay
+        return out
 
 
 def analyze_audio_file(filepath, output_name="example"):
@@ -37,7 +75,6 @@ def analyze_audio_file(filepath, output_name="example"):
     audio_processor = AudioProcessor()
     pitch_detector = PitchDetector()
     note_converter = NoteConverter()
-    visualizer = AudioVisualizer()
     midi_exporter = MidiExporter()
     print("✓ Components initialized")
     print()
@@ -51,7 +88,7 @@ def analyze_audio_file(filepath, output_name="example"):
     
     # Step 2: Preprocess
     print("Step 2: Preprocessing audio...")
-    audio_data = audio_processor.normalize_audio(audio_data)
+    audio_data = audio_processor.normalize_audio(audio_data, inplace=True)
     audio_data = audio_processor.trim_silence(audio_data)
     print("✓ Audio normalized and trimmed")
     print()
@@ -81,7 +118,7 @@ def analyze_audio_file(filepath, output_name="example"):
     print("Step 5: Converting frequencies to notes...")
     notes = note_converter.frequencies_to_notes(frequencies, times)
     segments = note_converter.get_note_segments(frequencies, times, min_duration=0.1)
-    stats = note_converter.get_note_statistics(frequencies, times)
+    stats = note_converter.get_note_statistics(frequencies, times, notes=notes)
     
     print(f"✓ Converted to {len(notes)} notes")
     print(f"✓ Created {len(segments)} note segments")
@@ -106,32 +143,34 @@ def analyze_audio_file(filepath, output_name="example"):
     print("Step 6: Creating visualizations...")
     output_prefix = os.path.join(OUTPUT_DIR, output_name)
     
-    # Dashboard
     dashboard_path = f"{output_prefix}_dashboard.png"
-    visualizer.create_summary_dashboard(
-        audio_data, sr, times, frequencies, confidences,
-        notes, stats,
-        output_path=dashboard_path
-    )
-    print(f"✓ Created dashboard: {dashboard_path}")
-    
-    # Individual plots
     pitch_path = f"{output_prefix}_pitch.png"
-    visualizer.plot_pitch_over_time(times, frequencies, confidences, output_path=pitch_path)
-    print(f"✓ Created pitch plot: {pitch_path}")
-    
     notes_path = f"{output_prefix}_notes.png"
-    visualizer.plot_notes_over_time(notes, output_path=notes_path)
-    print(f"✓ Created notes plot: {notes_path}")
+    piano_roll_path = f"{output_prefix}_piano_roll.png"
+    dist_path = f"{output_prefix}_distribution.png"
     
     piano_roll = note_converter.create_piano_roll_data(frequencies, times)
-    piano_roll_path = f"{output_prefix}_piano_roll.png"
-    visualizer.plot_piano_roll(piano_roll, output_path=piano_roll_path)
-    print(f"✓ Created piano roll: {piano_roll_path}")
     
-    dist_path = f"{output_prefix}_distribution.png"
-    visualizer.plot_note_distribution(stats, output_path=dist_path)
-    print(f"✓ Created note distribution: {dist_path}")
+    # (label, AudioVisualizer method, args, output path)
+    plots = [
+        ("dashboard", 'create_summary_dashboard',
+         (audio_data, sr, times, frequencies, confidences, notes, stats), dashboard_path),
+        ("pitch plot", 'plot_pitch_over_time', (times, frequencies, confidences), pitch_path),
+        ("notes plot", 'plot_notes_over_time', (notes,), notes_path),
+        ("piano roll", 'plot_piano_roll', (piano_roll,), piano_roll_path),
+        ("note distribution", 'plot_note_distribution', (stats,), dist_path),
+    ]
+    
+    # The figures are independent and Agg rendering is CPU-bound, so draw
+    # them in parallel worker processes
+    with ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as pool:
+        futures = [
+            pool.submit(render_visualization, method, args, path)
+            for _, method, args, path in plots
+        ]
+        for (label, _, _, path), future in zip(plots, futures):
+            future.result()
+            print(f"✓ Created {label}: {path}")
     print()
     
     # Step 7: Export MIDI
@@ -143,7 +182,6 @@ def analyze_audio_file(filepath, output_name="example"):
     
     # Step 8: Export JSON
     print("Step 8: Exporting to JSON...")
-    import json
     json_path = f"{output_prefix}.json"
     json_data = {
         'metadata': {
@@ -155,8 +193,8 @@ def analyze_audio_file(filepath, output_name="example"):
         'notes': notes[:100],  # First 100 notes
         'segments': segments
     }
-    with open(json_path, 'w') as f:
-        json.dump(json_data, f, indent=2)
+    with open(json_path, 'wb') as f:
+        f.write(dumps_json(json_data))
     print(f"✓ Created JSON file: {json_path}")
     print()
     
@@ -186,27 +224,30 @@ def create_synthetic_example():
     sample_rate = 44100
     duration_per_note = 0.5
     
-    # C4, D4, E4, F4, G4, A4, B4, C5
-    scale_freqs = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00, 493.88, 523.25]
+    n_samples = int(sample_rate * duration_per_note)
     
-    audio_segments = []
-    for freq in scale_freqs:
-        t = np.linspace(0, duration_per_note, int(sample_rate * duration_per_note))
+    if NUMBA_AVAILABLE:
+        audio_data = _synth_scale_jit(
+            _C_MAJOR_HZ, sample_rate, n_samples, duration_per_note
+        )
+    else:
+        # All notes at once: one row per note, broadcast against a shared time axis
+        t = np.arange(n_samples, dtype=np.float32) / sample_rate
+        phase = 2 * np.pi * _C_MAJOR_HZ[:, None] * t
         # Add some harmonics for richer sound
-        segment = (np.sin(2 * np.pi * freq * t) +
-                  0.3 * np.sin(2 * np.pi * 2 * freq * t) +
-                  0.1 * np.sin(2 * np.pi * 3 * freq * t))
+        notes = np.sin(phase)
+        notes += 0.3 * np.sin(2 * phase)
+        notes += 0.1 * np.sin(3 * phase)
         # Apply envelope
-        envelope = np.exp(-2 * t / duration_per_note)
-        segment = segment * envelope
-        audio_segments.append(segment)
-    
-    audio_data = np.concatenate(audio_segments)
+        notes *= np.exp(-2 * t / duration_per_note)
+        
+        audio_data = notes.reshape(-1)
     
     # Save to temp file
     import soundfile as sf
-    temp_path = os.path.join("temp", "synthetic_scale.wav")
-    sf.write(temp_path, audio_data, sample_rate)
+    ensure_dirs()
+    temp_path = os.path.join(TEMP_DIR, "synthetic_scale.wav")
+    sf.write(temp_path, audio_data, sample_rate, subtype='PCM_16')
     
     print(f"✓ Created synthetic scale: {temp_path}")
     print()
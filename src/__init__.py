@@ -3,11 +3,7 @@ Music Analyzer Package
 Analyzes music from URLs and converts to musical notes with visualizations
 """
 
-from .audio_processor import AudioProcessor
-from .pitch_detector import PitchDetector
-from .note_converter import NoteConverter
-from .visualizer import AudioVisualizer
-from .midi_exporter import MidiExporter
+import importlib
 
 __version__ = '1.0.0'
 __all__ = [
@@ -17,3 +13,26 @@ __all__ = [
     'AudioVisualizer',
     'MidiExporter'
 ]
+
+# Submodule providing each public class. They are imported on first access so
+# that importing a light module (e.g. src.config) doesn't load librosa,
+# matplotlib, pretty_midi and friends.
+_EXPORTS = {
+    'AudioProcessor': '.audio_processor',
+    'PitchDetector': '.pitch_detector',
+    'NoteConverter': '.note_converter',
+    'AudioVisualizer': '.visualizer',
+    'MidiExporter': '.midi_exporter',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
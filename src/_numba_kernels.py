@@ -0,0 +1,150 @@
+"""
+numba kernels for the array loops in utils
+
+Imported by utils on first use only, so importing utils does not pay for
+importing numba. The kernels only touch arrays, so they release the GIL
+and can run alongside the audio/UI threads.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def moving_average(data, window_size):
+    """JIT version of utils.smooth_array (same output as np.convolve 'same')"""
+    n = data.shape[0]
+    offset = (window_size - 1) // 2
+    result = np.empty(n)
+    for i in range(n):
+        m = i + offset
+        start = max(0, m - window_size + 1)
+        stop = min(n - 1, m)
+        total = 0.0
+        for j in range(start, stop + 1):
+            total += data[j]
+        result[i] = total / window_size
+    return result
+
+@njit(cache=True, nogil=True)
+def remove_outliers(data, threshold):
+    """JIT version of utils.remove_outliers"""
+    median = np.median(data)
+    mad = np.median(np.abs(data - median))
+    result = data.copy()
+    if mad == 0:
+        return result
+    for i in range(data.shape[0]):
+        if abs(0.6745 * (data[i] - median) / mad) > threshold:
+            result[i] = median
+    return result
+
+@njit(cache=True, nogil=True)
+def peak_amplitude(data):
+    """JIT version of utils.peak_amplitude (single pass)"""
+    peak = 0.0
+    for i in range(data.shape[0]):
+        v = abs(data[i])
+        if v > peak:
+            peak = v
+    return peak
+
+@njit(cache=True, nogil=True)
+def gather_positive(data):
+    """Indices and float64 values of the entries > 0"""
+    count = 0
+    for i in range(data.shape[0]):
+        if data[i] > 0:
+            count += 1
+    idx = np.empty(count, dtype=np.int64)
+    values = np.empty(count)
+    j = 0
+    for i in range(data.shape[0]):
+        if data[i] > 0:
+            idx[j] = i
+            values[j] = data[i]
+            j += 1
+    return idx, values
+
+@njit(cache=True, nogil=True)
+def interpolate_gaps(data):
+    """JIT version of utils.interpolate_gaps (same output as np.interp), in place"""
+    n = data.shape[0]
+    first = -1
+    last = -1
+    for i in range(n):
+        if data[i] != 0 and not np.isnan(data[i]):
+            if first < 0:
+                first = i
+            last = i
+    if first < 0:
+        return
+    # Edges take the nearest valid value, like np.interp
+    edge = data[first]
+    for i in range(first):
+        data[i] = edge
+    edge = data[last]
+    for i in range(last + 1, n):
+        data[i] = edge
+    prev = first
+    i = first + 1
+    while i <= last:
+        if data[i] != 0 and not np.isnan(data[i]):
+            prev = i
+            i += 1
+            continue
+        nxt = i + 1
+        while data[nxt] == 0 or np.isnan(data[nxt]):
+            nxt += 1
+        left = np.float64(data[prev])
+        right = np.float64(data[nxt])
+        slope = (right - left) / (nxt - prev)
+        for k in range(i, nxt):
+            data[k] = slope * (k - prev) + left
+        prev = nxt
+        i = nxt + 1
+
+@njit(cache=True, nogil=True)
+def post_process(frequencies, confidences, min_confidence, smooth,
+                      remove_outliers_flag, interpolate, window_size, outlier_threshold):
+    """JIT version of utils.post_process_contour"""
+    processed = frequencies.copy()
+    for i in range(processed.shape[0]):
+        if confidences[i] < min_confidence:
+            processed[i] = 0
+    
+    if remove_outliers_flag:
+        idx, values = gather_positive(processed)
+        if idx.shape[0] > 0:
+            values = remove_outliers(values, outlier_threshold)
+            for j in range(idx.shape[0]):
+                processed[idx[j]] = values[j]
+    
+    if interpolate:
+        interpolate_gaps(processed)
+    
+    if smooth:
+        idx, values = gather_positive(processed)
+        if window_size >= 2 and idx.shape[0] >= window_size:
+            values = moving_average(values, window_size)
+            for j in range(idx.shape[0]):
+                processed[idx[j]] = values[j]
+    return processed
+
+@njit(cache=True, nogil=True)
+def note_ticks(times, valid, min_duration, ticks_per_unit):
+    """JIT version of utils.note_ticks"""
+    n = times.shape[0]
+    delta_ticks = np.zeros(n, dtype=np.int64)
+    duration_ticks = np.zeros(n, dtype=np.int64)
+    current_time = 0.0
+    for i in range(n):
+        if not valid[i]:
+            continue
+        delta = int((times[i] - current_time) * ticks_per_unit)
+        delta_ticks[i] = max(delta, 0)
+        duration = times[i + 1] - times[i] if i < n - 1 else min_duration
+        duration = max(duration, min_duration)
+        duration_ticks[i] = int(duration * ticks_per_unit)
+        current_time = times[i] + duration
+    return delta_ticks, duration_ticks
@@ -4,24 +4,46 @@ Handles downloading, loading, and converting audio files
 """
 
 import os
+import json
+import hashlib
+import subprocess
 import tempfile
-from typing import Optional, Tuple
+import threading
+from contextlib import contextmanager
+from typing import BinaryIO, Optional, Tuple, Union
 import numpy as np
-import librosa
 import soundfile as sf
-from pydub import AudioSegment
-import yt_dlp
-import requests
-from pathlib import Path
 
 from .config import (
     SAMPLE_RATE, TEMP_DIR, SUPPORTED_FORMATS,
-    MAX_DOWNLOAD_SIZE, ERROR_MESSAGES
+    MAX_DOWNLOAD_SIZE, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_PARTS, RANGED_DOWNLOAD_MIN_SIZE,
+    DECODE_CACHE_MAX_SIZE, ERROR_MESSAGES, FFMPEG_BIN, ensure_dirs
 )
-from .utils import get_logger, validate_url, clean_filename, get_file_size_mb
+from .utils import get_logger, validate_url, clean_filename, get_file_size_mb, peak_amplitude
 
 logger = get_logger(__name__)
 
+# Containers libsndfile decodes natively; these skip librosa's loader
+SOUNDFILE_FORMATS = frozenset({'.wav', '.flac', '.ogg'})
+
+# Samples squared at a time when measuring frame energies for trim_silence
+TRIM_BLOCK_SIZE = 1 << 20
+
+# Idle YoutubeDL instances kept per options set
+YDL_POOL_SIZE = 2
+
+# HTTP content type (without parameters) -> file extension for direct downloads
+CONTENT_TYPE_EXTENSIONS = {
+    'audio/mpeg': '.mp3',
+    'audio/mp3': '.mp3',
+    'audio/wav': '.wav',
+    'audio/wave': '.wav',
+    'audio/x-wav': '.wav',
+    'audio/flac': '.flac',
+    'audio/ogg': '.ogg',
+    'audio/mp4': '.m4a',
+}
+
 
 class AudioProcessor:
     """Class for processing audio files"""
@@ -35,6 +57,10 @@ class AudioProcessor:
         """
         self.sample_rate = sample_rate
         self.temp_dir = TEMP_DIR
+        ensure_dirs()
+        # Idle yt_dlp instances by options; building one loads every extractor
+        self._ydl_cache = {}
+        self._ydl_lock = threading.Lock()
         
     def process_from_url(self, url: str) -> Tuple[np.ndarray, int, str]:
         """
@@ -65,12 +91,13 @@ class AudioProcessor:
         
         return audio_data, sr, filepath
     
-    def process_from_file(self, filepath: str) -> Tuple[np.ndarray, int]:
+    def process_from_file(self, filepath: Union[str, BinaryIO]) -> Tuple[np.ndarray, int]:
         """
         Load and process audio from local file
         
         Args:
-            filepath: Path to audio file
+            filepath: Path to audio file, or a named file-like object
+                (e.g. a Streamlit upload) decoded from memory
             
         Returns:
             Tuple of (audio_data, sample_rate)
@@ -79,41 +106,265 @@ class AudioProcessor:
             FileNotFoundError: If file doesn't exist
             ValueError: If file format is not supported
         """
+        if hasattr(filepath, 'read'):
+            return self._process_from_buffer(filepath)
+        
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"File not found: {filepath}")
         
-        file_ext = Path(filepath).suffix.lower()
+        file_ext = os.path.splitext(filepath)[1].lower()
         if file_ext not in SUPPORTED_FORMATS:
             raise ValueError(ERROR_MESSAGES['format_not_supported'])
         
         logger.info(f"Processing audio from file: {filepath}")
         return self.load_audio(filepath)
     
-    def load_audio(self, filepath: str, mono: bool = True) -> Tuple[np.ndarray, int]:
+    def _process_from_buffer(self, buffer: BinaryIO) -> Tuple[np.ndarray, int]:
+        """
+        Load audio from an in-memory file-like object
+        
+        soundfile decodes WAV/FLAC/OGG/MP3 straight from the buffer; formats
+        it cannot read (e.g. M4A) are spilled to a temporary file for
+        librosa's audioread fallback, which needs a real path.
+        
+        Args:
+            buffer: File-like object with a ``name`` carrying the extension
+            
+        Returns:
+            Tuple of (audio_data, sample_rate)
+        """
+        name = getattr(buffer, 'name', '') or ''
+        file_ext = os.path.splitext(name)[1].lower()
+        if file_ext not in SUPPORTED_FORMATS:
+            raise ValueError(ERROR_MESSAGES['format_not_supported'])
+        
+        logger.info(f"Processing audio from memory: {name}")
+        buffer.seek(0)
+        try:
+            sf.info(buffer)
+        except Exception:
+            buffer.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=file_ext, dir=self.temp_dir, delete=False) as tmp:
+                tmp.write(buffer.read())
+            try:
+                return self.load_audio(tmp.name)
+            finally:
+                os.remove(tmp.name)
+        
+        buffer.seek(0)
+        return self.load_audio(buffer)
+    
+    def load_audio(self, filepath: Union[str, BinaryIO], mono: bool = True) -> Tuple[np.ndarray, int]:
         """
         Load audio file and convert to target format
         
         Args:
-            filepath: Path to audio file
+            filepath: Path to audio file or file-like object
             mono: Whether to convert to mono
             
         Returns:
             Tuple of (audio_data, sample_rate)
         """
+        cache_path = self._decode_cache_path(filepath, mono)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                # Read fully rather than memory-mapping, so a cache hit returns
+                # the same writeable ndarray a fresh decode does
+                audio_data = np.load(cache_path)
+            except (OSError, ValueError) as e:
+                # Damaged (e.g. truncated) cache file: drop it and decode again
+                logger.warning(f"Discarding unreadable decode cache {cache_path}: {e}")
+                try:
+                    os.unlink(cache_path)
+                except OSError:
+                    pass
+            else:
+                try:
+                    os.utime(cache_path)  # Mark as recently used for pruning
+                except OSError:
+                    pass
+                logger.info(f"Loaded decoded audio from cache: {cache_path}")
+                return audio_data, self.sample_rate
+        
         try:
-            # Load with librosa
-            audio_data, sr = librosa.load(
-                filepath,
-                sr=self.sample_rate,
-                mono=mono
-            )
+            if self._is_soundfile_source(filepath):
+                audio_data, sr = self._read_soundfile(filepath, mono)
+            else:
+                # Load with librosa
+                import librosa
+                audio_data, sr = librosa.load(
+                    filepath,
+                    sr=self.sample_rate,
+                    mono=mono
+                )
             
+            # Keep one dtype end to end so later steps never upcast to float64
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.float32)
             logger.info(f"Loaded audio: duration={len(audio_data)/sr:.2f}s, sr={sr}Hz")
-            return audio_data, sr
             
         except Exception as e:
             logger.error(f"Error loading audio: {e}")
             raise ValueError(ERROR_MESSAGES['processing_failed'])
+        
+        if cache_path:
+            self._write_decode_cache(cache_path, audio_data)
+        return audio_data, sr
+    
+    @staticmethod
+    def _is_soundfile_source(filepath: Union[str, BinaryIO]) -> bool:
+        # File objects only reach load_audio once sf.info has accepted them
+        if not isinstance(filepath, str):
+            return True
+        return os.path.splitext(filepath)[1].lower() in SOUNDFILE_FORMATS
+    
+    def _read_soundfile(self, source: Union[str, BinaryIO], mono: bool) -> Tuple[np.ndarray, int]:
+        """
+        Decode with soundfile directly, resampling only if needed
+        
+        Gives the same result as librosa.load (float32, channel mean,
+        soxr_hq resampling) without going through its loader.
+        
+        Args:
+            source: Path to audio file or file-like object
+            mono: Whether to convert to mono
+            
+        Returns:
+            Tuple of (audio_data, sample_rate)
+        """
+        audio_data, sr = sf.read(source, dtype='float32', always_2d=False)
+        if audio_data.ndim == 2:
+            # soundfile is (frames, channels); librosa's layout is (channels, frames)
+            audio_data = audio_data.mean(axis=1, dtype=np.float32) if mono else audio_data.T
+        if sr != self.sample_rate:
+            import librosa
+            audio_data = librosa.resample(audio_data, orig_sr=sr, target_sr=self.sample_rate)
+            sr = self.sample_rate
+        return audio_data, sr
+    
+    def _decode_cache_path(self, filepath: Union[str, BinaryIO], mono: bool) -> Optional[str]:
+        """
+        Location of the cached decode of a local file
+        
+        The key covers the file's path, mtime and size plus the decode
+        settings, so an edited file is decoded again. Files in temp_dir
+        (downloads, spilled uploads) are transient and never cached.
+        
+        Args:
+            filepath: Path to audio file or file-like object
+            mono: Whether the audio is mixed to mono
+            
+        Returns:
+            Path of the .npy cache file, or None if the input is not cacheable
+        """
+        if not isinstance(filepath, str):
+            return None
+        
+        filepath = os.path.abspath(filepath)
+        if os.path.dirname(filepath) == os.path.abspath(self.temp_dir):
+            return None
+        
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        
+        key = hashlib.blake2b(
+            f"{filepath}|{stat.st_mtime_ns}|{stat.st_size}|{self.sample_rate}|{mono}".encode(),
+            digest_size=8
+        ).hexdigest()
+        return os.path.join(self.temp_dir, f"cache_{key}.npy")
+    
+    def _write_decode_cache(self, cache_path: str, audio_data: np.ndarray):
+        """
+        Store a decode in the cache, then prune the cache to its size limit
+        
+        The array is written to a temporary file and renamed into place, so
+        a crash or a concurrent load never sees a partial cache file.
+        
+        Args:
+            cache_path: Path from _decode_cache_path
+            audio_data: Decoded audio
+        """
+        fd, tmp_path = tempfile.mkstemp(prefix='cache_', suffix='.npy.tmp', dir=self.temp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, audio_data)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write decode cache: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        
+        self._prune_decode_cache(keep=cache_path)
+    
+    def _prune_decode_cache(self, keep: Optional[str] = None,
+                            max_size: int = DECODE_CACHE_MAX_SIZE):
+        """
+        Remove least recently used cache_*.npy files beyond max_size bytes
+        
+        Args:
+            keep: Cache file never to remove (the one just written)
+            max_size: Total size the cache may occupy
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.temp_dir) as it:
+            for entry in it:
+                if entry.name.startswith('cache_') and entry.name.endswith('.npy'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        
+        for _, size, path in sorted(entries):
+            if total <= max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+    
+    @contextmanager
+    def _ydl(self, ydl_opts: dict):
+        """
+        Reusable YoutubeDL for the given options, held exclusively
+        
+        YoutubeDL isn't thread-safe, so each caller checks out an idle
+        instance for these options, or builds a new one when all are busy,
+        and returns it to the pool afterwards. A running download never
+        makes another caller wait.
+        
+        Args:
+            ydl_opts: yt_dlp options
+            
+        Yields:
+            yt_dlp.YoutubeDL
+        """
+        key = json.dumps(ydl_opts, sort_keys=True)
+        with self._ydl_lock:
+            idle = self._ydl_cache.setdefault(key, [])
+            ydl = idle.pop() if idle else None
+        if ydl is None:
+            import yt_dlp
+            ydl = yt_dlp.YoutubeDL(ydl_opts)
+        try:
+            yield ydl
+        finally:
+            with self._ydl_lock:
+                idle = self._ydl_cache[key]
+                if len(idle) < YDL_POOL_SIZE:
+                    idle.append(ydl)
+                    ydl = None
+            if ydl is not None and hasattr(ydl, 'close'):
+                ydl.close()
     
     def _download_youtube(self, url: str) -> str:
         """
@@ -140,7 +391,7 @@ class AudioProcessor:
         }
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._ydl(ydl_opts) as ydl:
                 logger.info("Downloading from YouTube...")
                 info = ydl.extract_info(url, download=True)
                 filename = ydl.prepare_filename(info)
@@ -167,6 +418,8 @@ class AudioProcessor:
         Returns:
             Path to downloaded file
         """
+        import requests
+        
         try:
             logger.info("Downloading audio file...")
             response = requests.get(url, stream=True, timeout=30)
@@ -184,10 +437,33 @@ class AudioProcessor:
             # Save to temp file
             filepath = os.path.join(self.temp_dir, f"downloaded_audio{ext}")
             
+            # Large files from servers that take byte ranges are fetched as
+            # DOWNLOAD_PARTS concurrent ranges instead of one connection
+            if (content_length >= RANGED_DOWNLOAD_MIN_SIZE
+                    and response.headers.get('accept-ranges', '').lower() == 'bytes'
+                    and not response.headers.get('content-encoding')):
+                response.close()
+                if self._download_ranged(url, filepath, content_length):
+                    logger.info(f"Downloaded to: {filepath} ({DOWNLOAD_PARTS} ranges)")
+                    return filepath
+                logger.info("Server did not honor range requests; downloading in one stream")
+                response = requests.get(url, stream=True, timeout=30)
+                response.raise_for_status()
+            
+            # The header can be missing or wrong, so also enforce the limit
+            # on the bytes actually received
+            downloaded = 0
             with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    downloaded += len(chunk)
+                    if downloaded > MAX_DOWNLOAD_SIZE:
+                        break
                     f.write(chunk)
             
+            if downloaded > MAX_DOWNLOAD_SIZE:
+                os.remove(filepath)
+                raise ValueError(f"File too large: more than {MAX_DOWNLOAD_SIZE / (1024*1024):.0f} MB")
+            
             logger.info(f"Downloaded to: {filepath}")
             return filepath
             
@@ -195,27 +471,63 @@ class AudioProcessor:
             logger.error(f"Direct download failed: {e}")
             raise ValueError(ERROR_MESSAGES['download_failed'])
     
+    def _download_ranged(self, url: str, filepath: str, size: int) -> bool:
+        """
+        Download a file as concurrent byte-range requests
+        
+        Each part is written at its offset in a file preallocated to size.
+        
+        Args:
+            url: Direct URL to audio file
+            filepath: Destination path
+            size: Total size in bytes (from content-length)
+            
+        Returns:
+            True if every part came back as a complete 206 response; False
+            if the server ignored the ranges (the file is then incomplete)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import requests
+        
+        part_size = -(-size // DOWNLOAD_PARTS)
+        ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+        
+        with open(filepath, 'wb') as f:
+            f.truncate(size)
+        
+        def fetch(byte_range):
+            start, end = byte_range
+            headers = {'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+            with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    return False
+                position = start
+                with open(filepath, 'r+b') as f:
+                    f.seek(start)
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        position += len(chunk)
+                        if position > end + 1:
+                            return False
+                        f.write(chunk)
+                return position == end + 1
+        
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='download') as pool:
+            return all(list(pool.map(fetch, ranges)))
+    
     def _get_extension_from_content_type(self, content_type: str) -> str:
         """
         Get file extension from content type
         
         Args:
-            content_type: HTTP content type
+            content_type: HTTP content type, possibly with parameters
+                (e.g. "audio/mpeg; charset=binary")
             
         Returns:
             File extension with dot
         """
-        mapping = {
-            'audio/mpeg': '.mp3',
-            'audio/mp3': '.mp3',
-            'audio/wav': '.wav',
-            'audio/wave': '.wav',
-            'audio/x-wav': '.wav',
-            'audio/flac': '.flac',
-            'audio/ogg': '.ogg',
-            'audio/mp4': '.m4a',
-        }
-        return mapping.get(content_type.lower(), '.mp3')
+        media_type = content_type.partition(';')[0].strip().lower()
+        return CONTENT_TYPE_EXTENSIONS.get(media_type, '.mp3')
     
     def save_audio(self, audio_data: np.ndarray, filepath: str, 
                    sample_rate: Optional[int] = None) -> None:
@@ -231,18 +543,28 @@ class AudioProcessor:
         sf.write(filepath, audio_data, sr)
         logger.info(f"Saved audio to: {filepath}")
     
-    def normalize_audio(self, audio_data: np.ndarray) -> np.ndarray:
+    def normalize_audio(self, audio_data: np.ndarray,
+                        inplace: bool = False) -> np.ndarray:
         """
         Normalize audio to [-1, 1] range
         
         Args:
             audio_data: Input audio data
+            inplace: Scale audio_data itself instead of allocating a new array
+                (only if it is a writeable float array; otherwise a copy is made)
             
         Returns:
-            Normalized audio data
+            Normalized audio data (float32 for integer input)
         """
-        max_val = np.max(np.abs(audio_data))
-        if max_val > 0:
+        if not np.issubdtype(audio_data.dtype, np.floating):
+            # Integer samples would otherwise be promoted to float64; the
+            # converted copy is ours to scale in place
+            audio_data = audio_data.astype(np.float32)
+            inplace = True
+        max_val = peak_amplitude(audio_data)
+        if max_val > 0 and max_val != 1.0:
+            if inplace and audio_data.flags.writeable:
+                return np.divide(audio_data, max_val, out=audio_data)
             return audio_data / max_val
         return audio_data
     
@@ -258,13 +580,114 @@ class AudioProcessor:
         Returns:
             Trimmed audio data
         """
-        trimmed, _ = librosa.effects.trim(
-            audio_data,
-            top_db=threshold_db
-        )
+        if self._edges_are_loud(audio_data, threshold_db):
+            logger.info("No leading/trailing silence to trim")
+            return audio_data
+        
+        if audio_data.ndim != 1:
+            import librosa
+            trimmed, _ = librosa.effects.trim(
+                audio_data,
+                top_db=threshold_db
+            )
+        else:
+            start, end = self._nonsilent_bounds(audio_data, threshold_db)
+            trimmed = audio_data[start:end]
         logger.info(f"Trimmed audio from {len(audio_data)} to {len(trimmed)} samples")
         return trimmed
     
+    @staticmethod
+    def _nonsilent_bounds(audio_data: np.ndarray, threshold_db: float,
+                          frame_length: int = 2048, hop_length: int = 512,
+                          block_size: int = TRIM_BLOCK_SIZE) -> Tuple[int, int]:
+        """
+        Sample range librosa.effects.trim would keep, computed block-wise
+        
+        Frames are centered and zero-padded like librosa's RMS, so each
+        frame's energy is the sum of frame_length // hop_length consecutive
+        hop-sized chunk energies. Chunk energies are accumulated over blocks
+        of block_size samples, so the only full-length temporary is one
+        value per hop rather than a squared copy of the signal.
+        
+        Args:
+            audio_data: Mono audio data
+            threshold_db: Threshold in dB below the loudest frame
+            frame_length: Frame length used by librosa.effects.trim
+            hop_length: Hop length used by librosa.effects.trim
+            block_size: Samples processed per block (rounded to hops)
+            
+        Returns:
+            Tuple of (start, end) sample indices
+        """
+        n = len(audio_data)
+        half = frame_length // 2
+        n_frames = 1 + n // hop_length
+        chunks_per_frame = frame_length // hop_length
+        
+        # Energy of each hop-sized chunk of the signal padded by `half` zeros
+        # on the left (half is a whole number of hops)
+        lead = half // hop_length
+        n_chunks = n_frames + chunks_per_frame - 1
+        chunk_energy = np.zeros(n_chunks)
+        block = max(hop_length, block_size - block_size % hop_length)
+        for offset in range(0, n, block):
+            seg = np.asarray(audio_data[offset:offset + block], dtype=np.float64)
+            pad = -len(seg) % hop_length
+            if pad:
+                seg = np.concatenate([seg, np.zeros(pad)])
+            seg = seg.reshape(-1, hop_length)
+            first = lead + offset // hop_length
+            chunk_energy[first:first + len(seg)] = np.einsum('ij,ij->i', seg, seg)
+        
+        # Sliding sum over chunks_per_frame chunks gives each frame's energy
+        csum = np.concatenate([[0.0], np.cumsum(chunk_energy)])
+        power = (csum[chunks_per_frame:chunks_per_frame + n_frames] - csum[:n_frames]) / frame_length
+        
+        # librosa: 10*log10(max(amin, p)) - 10*log10(max(amin, max p)) > -top_db
+        amin = 1e-10
+        floor = max(amin, power.max()) * 10 ** (-threshold_db / 10)
+        nonsilent = np.flatnonzero(np.maximum(power, amin) > floor)
+        if nonsilent.size == 0:
+            return 0, 0
+        return int(nonsilent[0]) * hop_length, min(n, (int(nonsilent[-1]) + 1) * hop_length)
+    
+    @staticmethod
+    def _edges_are_loud(audio_data: np.ndarray, threshold_db: float,
+                        frame_length: int = 2048, hop_length: int = 512) -> bool:
+        """
+        Check whether librosa.effects.trim would keep the whole signal
+        
+        trim drops edge frames whose RMS is more than threshold_db below the
+        loudest frame. The loudest frame's RMS never exceeds the peak sample,
+        so if the first and last (centered, zero-padded) frames are already
+        above that level relative to the peak, nothing would be trimmed and
+        the full framing pass can be skipped.
+        
+        Args:
+            audio_data: Input audio data
+            threshold_db: Threshold in dB below which to consider silence
+            frame_length: Frame length used by librosa.effects.trim
+            hop_length: Hop length used by librosa.effects.trim
+            
+        Returns:
+            True if trimming would be a no-op
+        """
+        n = len(audio_data)
+        if n < frame_length:
+            return False
+        
+        peak = peak_amplitude(audio_data)
+        if peak == 0:
+            return False
+        
+        half = frame_length // 2
+        last_center = (n // hop_length) * hop_length
+        head = audio_data[:half]
+        tail = audio_data[last_center - half:last_center + half]
+        
+        min_energy = frame_length * (peak * 10 ** (-threshold_db / 20)) ** 2
+        return bool(np.dot(head, head) > min_energy and np.dot(tail, tail) > min_energy)
+    
     def get_audio_info(self, filepath: str) -> dict:
         """
         Get information about audio file
@@ -275,6 +698,8 @@ class AudioProcessor:
         Returns:
             Dictionary with audio information
         """
+        import librosa
+        
         try:
             audio_data, sr = librosa.load(filepath, sr=None)
             duration = len(audio_data) / sr
@@ -290,148 +715,205 @@ class AudioProcessor:
             logger.error(f"Error getting audio info: {e}")
             return {}
     
-    def stream_youtube_audio(self, url: str, duration_limit: Optional[int] = None) -> Tuple[np.ndarray, int, dict]:
+    def _decode_stream_ffmpeg(self, audio_url: str,
+                              duration_limit: Optional[int] = None,
+                              http_headers: Optional[dict] = None) -> np.ndarray:
+        """
+        Decode a remote audio stream with FFmpeg into memory
+        
+        Args:
+            audio_url: Direct URL of the audio stream
+            duration_limit: Optional duration limit in seconds
+            http_headers: HTTP headers required by the stream host
+            
+        Returns:
+            Mono float32 audio data at self.sample_rate
+        """
+        cmd = [FFMPEG_BIN, '-hide_banner', '-loglevel', 'error', '-nostdin']
+        if http_headers:
+            headers = ''.join(f"{key}: {value}\r\n" for key, value in http_headers.items())
+            cmd += ['-headers', headers]
+        cmd += ['-i', audio_url]
+        if duration_limit:
+            cmd += ['-t', str(duration_limit)]
+        cmd += ['-vn', '-ac', '1', '-ar', str(self.sample_rate), '-f', 'f32le', 'pipe:1']
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=120)
+        except subprocess.TimeoutExpired:
+            raise ValueError(
+                f"Audio stream timed out.\n"
+                f"Try using 'Download & Analyze' mode instead."
+            )
+        
+        if result.returncode != 0:
+            logger.error(f"FFmpeg stream decode failed: {result.stderr.decode(errors='replace')}")
+            raise ValueError(
+                f"Cannot process audio stream.\n"
+                f"  • Network connection issue\n"
+                f"  • Stream URL expired\n"
+                f"Try using 'Download & Analyze' mode instead."
+            )
+        
+        return np.frombuffer(result.stdout, dtype=np.float32)
+    
+    def stream_youtube_audio(self, url: str, duration_limit: Optional[int] = None,
+                             info: Optional[dict] = None) -> Tuple[np.ndarray, int, dict]:
         """
         Stream audio from YouTube without saving to disk (memory-only processing)
         
         Args:
             url: YouTube URL
             duration_limit: Optional duration limit in seconds (for quick analysis)
+            info: Previously extracted video info (skips a second extraction)
             
         Returns:
             Tuple of (audio_data, sample_rate, metadata)
         """
-        import io
-        
         logger.info(f"Streaming audio from YouTube (no download): {url}")
         
         ydl_opts = {
-            'format': 'bestaudio/best',
+            'format': 'bestaudio[ext=m4a]/bestaudio/best',
             'quiet': True,
             'no_warnings': True,
             'extract_flat': False,
         }
         
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract video info without downloading
-                try:
-                    info = ydl.extract_info(url, download=False)
-                except Exception as e:
-                    logger.error(f"Failed to extract video info: {e}")
-                    raise ValueError(
-                        f"Cannot access video. Possible reasons:\n"
-                        f"  • Video is private or restricted\n"
-                        f"  • Age-restricted content\n"
-                        f"  • Geographical restrictions\n"
-                        f"  • Invalid URL\n"
-                        f"Try using 'Download & Analyze' mode instead."
-                    )
-                
-                if not info:
-                    raise ValueError("No video information available")
-                
-                # Get audio URL
-                audio_url = info.get('url')
-                if not audio_url:
-                    raise ValueError("Cannot extract audio stream URL. Try 'Download & Analyze' mode.")
-                
-                metadata = {
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'uploader': info.get('uploader', 'Unknown'),
-                    'view_count': info.get('view_count', 0)
-                }
+            if info is None:
+                with self._ydl(ydl_opts) as ydl:
+                    # Extract video info without downloading
+                    try:
+                        info = ydl.extract_info(url, download=False)
+                    except Exception as e:
+                        logger.error(f"Failed to extract video info: {e}")
+                        raise ValueError(
+                            f"Cannot access video. Possible reasons:\n"
+                            f"  • Video is private or restricted\n"
+                            f"  • Age-restricted content\n"
+                            f"  • Geographical restrictions\n"
+                            f"  • Invalid URL\n"
+                            f"Try using 'Download & Analyze' mode instead."
+                        )
+            
+            if not info:
+                raise ValueError("No video information available")
+            
+            # Get audio URL
+            audio_url = info.get('url')
+            if not audio_url:
+                raise ValueError("Cannot extract audio stream URL. Try 'Download & Analyze' mode.")
+            
+            metadata = {
+                'title': info.get('title', 'Unknown'),
+                'duration': info.get('duration', 0),
+                'uploader': info.get('uploader', 'Unknown'),
+                'view_count': info.get('view_count', 0)
+            }
+            
+            logger.info(f"Video: {metadata['title']} ({metadata['duration']}s)")
+            
+            # Fast path: let FFmpeg read the stream and decode only what we
+            # need, straight to mono float32 at the target sample rate
+            if FFMPEG_BIN:
+                audio_data = self._decode_stream_ffmpeg(
+                    audio_url, duration_limit, info.get('http_headers')
+                )
+                if len(audio_data) == 0:
+                    raise ValueError("Loaded audio is empty")
                 
-                logger.info(f"Video: {metadata['title']} ({metadata['duration']}s)")
+                logger.info(f"Streamed {len(audio_data)/self.sample_rate:.1f}s of audio")
+                return audio_data, self.sample_rate, metadata
+            
+            # Fallback without FFmpeg: download the stream and decode it with
+            # librosa (only this path needs either import)
+            import librosa
+            import requests
+            
+            # Stream audio data
+            try:
+                response = requests.get(audio_url, stream=True, timeout=30)
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to stream audio: {e}")
+                raise ValueError(
+                    f"Cannot download audio stream.\n"
+                    f"  • Network connection issue\n"
+                    f"  • Stream URL expired\n"
+                    f"Try using 'Download & Analyze' mode instead."
+                )
+            
+            # Stream straight into a temp file (librosa/ffmpeg need a path),
+            # so the audio is never buffered in memory as well
+            tmp_path = None
+            try:
+                with tempfile.NamedTemporaryFile(suffix='.m4a', delete=False) as tmp:
+                    tmp_path = tmp.name
+                    
+                    # Download with size limit
+                    max_size = 50 * 1024 * 1024  # 50 MB limit
+                    downloaded = 0
+                    
+                    try:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            if chunk:
+                                downloaded += len(chunk)
+                                if downloaded > max_size:
+                                    logger.warning("Reached download size limit")
+                                    break
+                                tmp.write(chunk)
+                    except Exception as e:
+                        logger.error(f"Error during streaming: {e}")
+                        if downloaded == 0:
+                            raise ValueError("Failed to download any audio data")
+                        logger.warning(f"Partial download: {downloaded / 1024 / 1024:.1f} MB")
+                    
+                    if tmp.tell() == 0:
+                        raise ValueError("No audio data downloaded")
+                    
+                    # The decoder reads the file front to back (Linux only)
+                    tmp.flush()
+                    if hasattr(os, 'posix_fadvise'):
+                        os.posix_fadvise(tmp.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
                 
-                # Stream audio data
+                # Load audio with optional duration limit
                 try:
-                    response = requests.get(audio_url, stream=True, timeout=30)
-                    response.raise_for_status()
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Failed to stream audio: {e}")
+                    if duration_limit:
+                        audio_data, sr = librosa.load(
+                            tmp_path,
+                            sr=self.sample_rate,
+                            mono=True,
+                            duration=duration_limit
+                        )
+                    else:
+                        audio_data, sr = librosa.load(
+                            tmp_path,
+                            sr=self.sample_rate,
+                            mono=True
+                        )
+                except Exception as e:
+                    logger.error(f"Failed to load audio: {e}")
                     raise ValueError(
-                        f"Cannot download audio stream.\n"
-                        f"  • Network connection issue\n"
-                        f"  • Stream URL expired\n"
+                        f"Cannot process audio file.\n"
+                        f"  • Audio format may not be supported\n"
+                        f"  • File may be corrupted\n"
                         f"Try using 'Download & Analyze' mode instead."
                     )
                 
-                audio_bytes = io.BytesIO()
-                
-                # Download to memory (with size limit)
-                max_size = 50 * 1024 * 1024  # 50 MB limit
-                downloaded = 0
-                
-                try:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            downloaded += len(chunk)
-                            if downloaded > max_size:
-                                logger.warning("Reached download size limit")
-                                break
-                            audio_bytes.write(chunk)
-                except Exception as e:
-                    logger.error(f"Error during streaming: {e}")
-                    if downloaded == 0:
-                        raise ValueError("Failed to download any audio data")
-                    logger.warning(f"Partial download: {downloaded / 1024 / 1024:.1f} MB")
-                
-                if audio_bytes.tell() == 0:
-                    raise ValueError("No audio data downloaded")
+                if len(audio_data) == 0:
+                    raise ValueError("Loaded audio is empty")
                 
-                audio_bytes.seek(0)
+                logger.info(f"Streamed {len(audio_data)/sr:.1f}s of audio")
+                return audio_data, sr, metadata
                 
-                # Save to temp file (required for librosa/ffmpeg)
-                import tempfile
-                tmp_path = None
-                try:
-                    with tempfile.NamedTemporaryFile(suffix='.m4a', delete=False) as tmp:
-                        tmp.write(audio_bytes.read())
-                        tmp_path = tmp.name
-                    
-                    if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
-                        raise ValueError("Temporary file is empty")
-                    
-                    # Load audio with optional duration limit
+            finally:
+                # Clean up temp file
+                if tmp_path and os.path.exists(tmp_path):
                     try:
-                        if duration_limit:
-                            audio_data, sr = librosa.load(
-                                tmp_path,
-                                sr=self.sample_rate,
-                                mono=True,
-                                duration=duration_limit
-                            )
-                        else:
-                            audio_data, sr = librosa.load(
-                                tmp_path,
-                                sr=self.sample_rate,
-                                mono=True
-                            )
+                        os.unlink(tmp_path)
                     except Exception as e:
-                        logger.error(f"Failed to load audio: {e}")
-                        raise ValueError(
-                            f"Cannot process audio file.\n"
-                            f"  • Audio format may not be supported\n"
-                            f"  • File may be corrupted\n"
-                            f"Try using 'Download & Analyze' mode instead."
-                        )
-                    
-                    if len(audio_data) == 0:
-                        raise ValueError("Loaded audio is empty")
-                    
-                    logger.info(f"Streamed {len(audio_data)/sr:.1f}s of audio")
-                    return audio_data, sr, metadata
-                    
-                finally:
-                    # Clean up temp file
-                    if tmp_path and os.path.exists(tmp_path):
-                        try:
-                            os.unlink(tmp_path)
-                        except Exception as e:
-                            logger.warning(f"Failed to delete temp file: {e}")
-                
+                        logger.warning(f"Failed to delete temp file: {e}")
+            
         except ValueError:
             # Re-raise ValueError with our custom messages
             raise
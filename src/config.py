@@ -4,15 +4,23 @@ Contains all constants, settings, and parameters
 """
 
 import os
+import shutil
 
 # Project directories
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 TEMP_DIR = os.path.join(BASE_DIR, 'temp')
 OUTPUT_DIR = os.path.join(BASE_DIR, 'outputs')
 
-# Create directories if they don't exist
-os.makedirs(TEMP_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Directories are created on first use rather than at import
+_dirs_ensured = False
+
+def ensure_dirs() -> None:
+    """Create TEMP_DIR and OUTPUT_DIR if they don't exist (once per process)"""
+    global _dirs_ensured
+    if not _dirs_ensured:
+        os.makedirs(TEMP_DIR, exist_ok=True)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _dirs_ensured = True
 
 # Audio processing settings
 SAMPLE_RATE = 44100  # Hz
@@ -59,9 +67,20 @@ COLORMAP = 'viridis'
 # URL download settings
 DOWNLOAD_FORMAT = 'bestaudio/best'
 MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 100 MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB per read/write
+DOWNLOAD_PARTS = 4  # Parallel range requests for large direct downloads
+RANGED_DOWNLOAD_MIN_SIZE = 8 * 1024 * 1024  # Smaller files use one stream
+
+# Decoded-audio cache (cache_*.npy in TEMP_DIR); least recently used files
+# are removed once the total exceeds this
+DECODE_CACHE_MAX_SIZE = 1024 * 1024 * 1024  # 1 GB
+
+# External tools (resolved once; None if FFmpeg is not installed)
+FFMPEG_BIN = shutil.which('ffmpeg')
 
-# Supported audio formats
-SUPPORTED_FORMATS = ['.mp3', '.wav', '.flac', '.ogg', '.m4a', '.wma']
+# Supported audio formats (tuple keeps the display order, set is for lookups)
+SUPPORTED_EXTENSIONS = ('.mp3', '.wav', '.flac', '.ogg', '.m4a', '.wma')
+SUPPORTED_FORMATS = frozenset(SUPPORTED_EXTENSIONS)
 
 # Error messages
 ERROR_MESSAGES = {
@@ -69,5 +88,5 @@ ERROR_MESSAGES = {
     'download_failed': 'Failed to download audio from URL.',
     'processing_failed': 'Failed to process audio file.',
     'no_pitch_detected': 'No clear pitch detected in the audio. Try a different file.',
-    'format_not_supported': f'Audio format not supported. Supported formats: {", ".join(SUPPORTED_FORMATS)}'
+    'format_not_supported': f'Audio format not supported. Supported formats: {", ".join(SUPPORTED_EXTENSIONS)}'
 }
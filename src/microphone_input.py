@@ -5,33 +5,120 @@ Allows users to record and analyze their voice in real-time
 
 import numpy as np
 import sounddevice as sd
-import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import Optional, Callable, List, Tuple
 import logging
 
+from .utils import NUMBA_AVAILABLE, peak_amplitude
+
+# Optional SIMD RMS kernel
+try:
+    from numpy_rms import rms as _rms_simd
+    NUMPY_RMS_AVAILABLE = True
+except ImportError:
+    NUMPY_RMS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Longest stretch of unread audio the capture buffer holds (older audio is
+# overwritten once it is full)
+MAX_RECORDING_SECONDS = 600
+
+# Initial capture buffer size; it doubles (up to MAX_RECORDING_SECONDS)
+# whenever the unread audio would not fit
+INITIAL_BUFFER_SECONDS = 10
+
+# Frames per stream callback (fixed, so every callback is one known-size copy)
+STREAM_BLOCKSIZE = 1024
+
+# How often (seconds) a recording streamed to a file is written out
+FILE_WRITE_INTERVAL = 0.5
+
+# Seconds a sd.query_devices() result is reused (device topology rarely
+# changes, and every query makes PortAudio enumerate all host APIs)
+DEVICE_CACHE_TTL = 30.0
+
+# sd.query_devices() results by kind, as (time fetched, result)
+_device_cache = {}
+_device_cache_lock = threading.Lock()
+
+
+def _cached_devices(kind: Optional[str] = None):
+    """
+    sd.query_devices(kind=kind), reused for DEVICE_CACHE_TTL seconds
+    
+    Args:
+        kind: None for all devices, 'input' for the default input device
+        
+    Returns:
+        Whatever sd.query_devices returns for kind
+    """
+    now = time.monotonic()
+    with _device_cache_lock:
+        entry = _device_cache.get(kind)
+        if entry is None or now - entry[0] > DEVICE_CACHE_TTL:
+            entry = (now, sd.query_devices(kind=kind))
+            _device_cache[kind] = entry
+        return entry[1]
+
+
+def refresh_devices():
+    """Forget cached device lists so the next query asks PortAudio again"""
+    with _device_cache_lock:
+        _device_cache.clear()
+
 
 class MicrophoneRecorder:
-    """Record and analyze audio from microphone in real-time"""
+    """
+    Record and analyze audio from microphone in real-time
+    
+    The capture buffer has a single read cursor, so each recording has one
+    consumer: either the caller (get_current_audio/stop_recording, or a
+    RealTimeAnalyzer through set_analysis_hook) or, when recording to
+    output_path, the file writer thread. An analysis hook cannot be set
+    while recording to a file, and vice versa.
+    """
     
-    def __init__(self, sample_rate: int = 22050, channels: int = 1):
+    def __init__(self, sample_rate: int = 22050, channels: int = 1,
+                 max_duration: float = MAX_RECORDING_SECONDS):
         """
         Initialize microphone recorder
         
         Args:
             sample_rate: Sample rate for recording
             channels: Number of audio channels (1 for mono)
+            max_duration: Capacity of the capture buffer in seconds
         """
         self.sample_rate = sample_rate
         self.channels = channels
+        self.max_duration = max_duration
         self.is_recording = False
-        self.audio_queue = queue.Queue()
-        self.recorded_audio = []
         self.stream = None
         
+        # Single-producer/single-consumer ring buffer, allocated per recording
+        # and grown by the callback as needed. Only the audio callback
+        # advances _write_pos and only readers advance _read_pos; both count
+        # frames since the recording started. The callback writes through a
+        # flat byte view of the same memory.
+        self._buffer = None
+        self._buffer_bytes = None
+        self._max_frames = 0
+        self._frame_bytes = 4 * channels  # float32 samples
+        self._write_pos = 0
+        self._read_pos = 0
+        
+        # Background writer when recording straight to a file
+        self._output_file = None
+        self._writer_thread = None
+        self._writer_stop = threading.Event()
+        
+        # Called from the audio callback every _hook_interval frames
+        self._analysis_hook = None
+        self._hook_interval = 0
+        self._frames_since_hook = 0
+        
     def list_devices(self) -> List[dict]:
         """
         List all available audio input devices
@@ -39,7 +126,7 @@ class MicrophoneRecorder:
         Returns:
             List of device dictionaries
         """
-        devices = sd.query_devices()
+        devices = _cached_devices()
         input_devices = []
         
         for idx, device in enumerate(devices):
@@ -56,7 +143,7 @@ class MicrophoneRecorder:
     def get_default_device(self) -> Optional[dict]:
         """Get the default input device"""
         try:
-            default_device = sd.query_devices(kind='input')
+            default_device = _cached_devices('input')
             return {
                 'index': sd.default.device[0],
                 'name': default_device['name'],
@@ -68,34 +155,191 @@ class MicrophoneRecorder:
             return None
     
     def _audio_callback(self, indata, frames, time_info, status):
-        """Callback function for audio stream"""
+        """Callback function for audio stream (indata is the raw block)"""
         if status:
             logger.warning(f"Audio stream status: {status}")
         
-        # Copy audio data to queue
-        self.audio_queue.put(indata.copy())
+        buffer = self._buffer
+        write_pos = self._write_pos
+        needed = write_pos + frames - self._read_pos
+        if needed > len(buffer) and len(buffer) < self._max_frames:
+            buffer = self._grow(needed)
+        
+        # Copy the block's bytes straight into the ring buffer (wrapping at
+        # the end), then publish the new write position
+        ring = self._buffer_bytes
+        block = memoryview(indata).cast('B')
+        frame_bytes = self._frame_bytes
+        capacity = len(buffer)
+        start = write_pos % capacity
+        first = min(frames, capacity - start) * frame_bytes
+        ring[start * frame_bytes:start * frame_bytes + first] = block[:first]
+        if first < len(block):
+            ring[:len(block) - first] = block[first:]
+        self._write_pos = write_pos + frames
+        
+        hook = self._analysis_hook
+        if hook is not None:
+            self._frames_since_hook += frames
+            if self._frames_since_hook >= self._hook_interval:
+                self._frames_since_hook = 0
+                hook()
     
-    def start_recording(self, device: Optional[int] = None, duration: Optional[float] = None):
+    def set_analysis_hook(self, hook: Optional[Callable[[], None]], interval: float = 0.5):
+        """
+        Run a function from the audio callback whenever interval seconds of
+        new audio have been captured
+        
+        The hook runs on the audio thread, so it should only hand work off
+        (e.g. submit it to an executor) and return.
+        
+        Args:
+            hook: Function taking no arguments (None to remove the hook)
+            interval: Seconds of audio between calls
+            
+        Raises:
+            RuntimeError: If the recording is being streamed to a file (the
+                file writer already consumes the captured audio)
+        """
+        if hook is not None and self._output_file is not None:
+            raise RuntimeError("Cannot analyze a recording that is being streamed to a file")
+        self._hook_interval = max(1, int(interval * self.sample_rate))
+        self._frames_since_hook = 0
+        self._analysis_hook = hook
+    
+    def _grow(self, needed: int) -> np.ndarray:
+        """
+        Replace the ring buffer with a larger one, keeping the unread frames
+        
+        Called from the audio callback; the capacity doubles until it holds
+        needed frames (capped at max_duration), so a recording only
+        reallocates a handful of times.
+        
+        Args:
+            needed: Frames the buffer should hold
+            
+        Returns:
+            The new buffer
+        """
+        buffer = self._buffer
+        capacity = len(buffer)
+        while capacity < needed:
+            capacity *= 2
+        capacity = min(capacity, self._max_frames)
+        
+        grown = np.empty((capacity, self.channels), dtype=np.float32)
+        write_pos = self._write_pos
+        read_pos = max(self._read_pos, write_pos - len(buffer))
+        self._copy_span(buffer, grown, read_pos, write_pos)
+        self._buffer_bytes = memoryview(grown).cast('B')
+        self._buffer = grown
+        return grown
+    
+    @staticmethod
+    def _copy_span(source: np.ndarray, target: np.ndarray,
+                   start_pos: int, end_pos: int, shift: int = 0):
+        """
+        Copy frames start_pos..end_pos of a ring buffer into another buffer
+        
+        Frame p is read from source[p % len(source)] and written to
+        target[(p + shift) % len(target)], split wherever either side wraps.
+        """
+        pos = start_pos
+        while pos < end_pos:
+            src = pos % len(source)
+            dst = (pos + shift) % len(target)
+            count = min(end_pos - pos, len(source) - src, len(target) - dst)
+            target[dst:dst + count] = source[src:src + count]
+            pos += count
+    
+    def _take_unread(self, release: bool = False) -> np.ndarray:
+        """
+        Copy out the frames recorded since the last read and mark them read
+        
+        Args:
+            release: The buffer is being discarded, so a span that doesn't
+                wrap can be returned as a view instead of a copy
+        
+        Returns:
+            1D array of the unread audio (empty if there is none)
+        """
+        # Read the write position before the buffer: a buffer swapped in by
+        # _grow after this point still holds every frame up to write_pos
+        write_pos = self._write_pos
+        buffer = self._buffer
+        if buffer is None:
+            return np.array([])
+        
+        capacity = len(buffer)
+        read_pos = self._read_pos
+        if write_pos - read_pos > capacity:
+            dropped = write_pos - read_pos - capacity
+            logger.warning(f"Capture buffer full, dropped {dropped / self.sample_rate:.2f}s of audio")
+            read_pos = write_pos - capacity
+        
+        if write_pos == read_pos:
+            self._read_pos = write_pos
+            return np.array([])
+        
+        start = read_pos % capacity
+        if release and start + (write_pos - read_pos) <= capacity:
+            audio_data = buffer[start:start + write_pos - read_pos]
+        else:
+            # Copy the unread span (two pieces if it wraps) into one output
+            # buffer; flattening that is a view, not another copy
+            audio_data = np.empty((write_pos - read_pos, self.channels), dtype=np.float32)
+            self._copy_span(buffer, audio_data, read_pos, write_pos, shift=-read_pos)
+        
+        # Only mark the frames read once they are copied, so the callback
+        # keeps them intact (or carries them over when growing) until then
+        self._read_pos = write_pos
+        return audio_data.reshape(-1)  # Ensure 1D array
+    
+    def start_recording(self, device: Optional[int] = None, duration: Optional[float] = None,
+                        output_path: Optional[str] = None):
         """
         Start recording from microphone
         
         Args:
             device: Device index (None for default)
             duration: Maximum duration in seconds (None for unlimited)
+            output_path: Audio file to stream the recording to (format from
+                the extension). A background thread writes it out every
+                FILE_WRITE_INTERVAL seconds, so only the unwritten audio is
+                kept in memory; the audio is then not available from
+                get_current_audio or stop_recording.
+                
+        Raises:
+            RuntimeError: If output_path is given while an analysis hook is
+                set (both would consume the captured audio)
         """
         if self.is_recording:
             logger.warning("Already recording")
             return
+        if output_path and self._analysis_hook is not None:
+            raise RuntimeError("Cannot stream to a file while an analysis hook is set")
         
         self.is_recording = True
-        self.recorded_audio = []
+        self._max_frames = int(self.max_duration * self.sample_rate)
+        self._buffer = np.empty(
+            (min(self._max_frames, int(INITIAL_BUFFER_SECONDS * self.sample_rate)), self.channels),
+            dtype=np.float32
+        )
+        self._buffer_bytes = memoryview(self._buffer).cast('B')
+        self._write_pos = 0
+        self._read_pos = 0
         
         try:
-            # Open audio stream
-            self.stream = sd.InputStream(
+            if output_path:
+                self._start_file_writer(output_path)
+            
+            # Open audio stream (raw blocks, so no ndarray is built per callback)
+            self.stream = sd.RawInputStream(
                 device=device,
                 channels=self.channels,
                 samplerate=self.sample_rate,
+                blocksize=STREAM_BLOCKSIZE,
+                dtype='float32',
                 callback=self._audio_callback
             )
             self.stream.start()
@@ -110,14 +354,66 @@ class MicrophoneRecorder:
         except Exception as e:
             logger.error(f"Error starting recording: {e}")
             self.is_recording = False
+            self._stop_file_writer()
+            self._buffer = None
+            self._buffer_bytes = None
             raise
     
+    def _start_file_writer(self, output_path: str):
+        """
+        Open output_path and start the thread that drains the capture buffer
+        into it
+        
+        Args:
+            output_path: Audio file to write
+        """
+        import soundfile as sf
+        self._output_file = sf.SoundFile(
+            output_path, 'w', samplerate=self.sample_rate, channels=self.channels
+        )
+        self._writer_stop.clear()
+        self._writer_thread = threading.Thread(
+            target=self._file_writer_loop, name='recording-writer', daemon=True
+        )
+        self._writer_thread.start()
+    
+    def _file_writer_loop(self):
+        """Write the captured audio out in FILE_WRITE_INTERVAL batches"""
+        while not self._writer_stop.wait(FILE_WRITE_INTERVAL):
+            self._write_unread_to_file()
+    
+    def _write_unread_to_file(self):
+        """Append the audio captured since the last write to the output file"""
+        audio_data = self._take_unread()
+        if len(audio_data) > 0:
+            try:
+                self._output_file.write(audio_data.reshape(-1, self.channels))
+            except Exception as e:
+                logger.error(f"Error writing recording to file: {e}")
+    
+    def _stop_file_writer(self):
+        """Stop the writer thread, write the remaining audio and close the file"""
+        if self._output_file is None:
+            return
+        
+        self._writer_stop.set()
+        if self._writer_thread:
+            self._writer_thread.join()
+            self._writer_thread = None
+        self._write_unread_to_file()
+        
+        logger.info(f"Saved recording to {self._output_file.name} "
+                    f"({self._output_file.frames / self.sample_rate:.2f}s)")
+        self._output_file.close()
+        self._output_file = None
+    
     def stop_recording(self) -> np.ndarray:
         """
         Stop recording and return recorded audio
         
         Returns:
-            NumPy array with recorded audio data
+            NumPy array with recorded audio data (empty when recording to
+            a file)
         """
         if not self.is_recording:
             logger.warning("Not currently recording")
@@ -130,18 +426,19 @@ class MicrophoneRecorder:
             self.stream.close()
             self.stream = None
         
-        # Collect all audio from queue
-        while not self.audio_queue.empty():
-            try:
-                chunk = self.audio_queue.get_nowait()
-                self.recorded_audio.append(chunk)
-            except queue.Empty:
-                break
-        
-        # Concatenate all chunks
-        if self.recorded_audio:
-            audio_data = np.concatenate(self.recorded_audio, axis=0)
-            audio_data = audio_data.flatten()  # Ensure 1D array
+        # Finish the output file, if any
+        if self._output_file is not None:
+            self._stop_file_writer()
+            self._buffer = None
+            self._buffer_bytes = None
+            return np.array([])
+        
+        # Collect the audio that hasn't been read yet and release the buffer
+        audio_data = self._take_unread(release=True)
+        self._buffer = None
+        self._buffer_bytes = None
+        
+        if len(audio_data) > 0:
             logger.info(f"Recording stopped. Duration: {len(audio_data) / self.sample_rate:.2f}s")
             return audio_data
         else:
@@ -190,23 +487,13 @@ class MicrophoneRecorder:
         Get currently recorded audio without stopping
         
         Returns:
-            NumPy array with audio recorded so far
+            NumPy array with audio recorded since the last read (empty when
+            recording to a file, whose writer consumes the audio)
         """
-        current_audio = []
-        
-        # Collect all audio from queue without blocking
-        while not self.audio_queue.empty():
-            try:
-                chunk = self.audio_queue.get_nowait()
-                current_audio.append(chunk)
-            except queue.Empty:
-                break
-        
-        if current_audio:
-            audio_data = np.concatenate(current_audio, axis=0)
-            return audio_data.flatten()
-        else:
+        if self._output_file is not None:
+            logger.warning("Recording is being streamed to a file")
             return np.array([])
+        return self._take_unread()
     
     def test_microphone(self, duration: float = 2.0) -> bool:
         """
@@ -223,7 +510,7 @@ class MicrophoneRecorder:
             audio = self.record_duration(duration)
             
             # Check if audio has any signal
-            if len(audio) > 0 and np.abs(audio).max() > 0.001:
+            if len(audio) > 0 and peak_amplitude(audio) > 0.001:
                 logger.info("Microphone test successful")
                 return True
             else:
@@ -247,9 +534,21 @@ class MicrophoneRecorder:
         if len(audio_data) == 0:
             return 0.0
         
-        rms = np.sqrt(np.mean(audio_data ** 2))
+        if (NUMPY_RMS_AVAILABLE and audio_data.dtype == np.float32
+                and audio_data.ndim == 1 and audio_data.flags.c_contiguous):
+            return float(_rms_simd(audio_data, window_size=len(audio_data))[0])
+        
+        rms = np.sqrt(self._sum_of_squares(audio_data) / audio_data.size)
         return float(rms)
     
+    @staticmethod
+    def _sum_of_squares(audio_data: np.ndarray) -> float:
+        """Sum of squared samples as one dot product (no squared copy)"""
+        samples = audio_data.reshape(-1)
+        if not np.issubdtype(samples.dtype, np.floating):
+            samples = samples.astype(np.float64)  # Integer squares would overflow
+        return float(np.dot(samples, samples))
+    
     def is_silent(self, audio_data: np.ndarray, threshold: float = 0.01) -> bool:
         """
         Check if audio is silent
@@ -261,8 +560,11 @@ class MicrophoneRecorder:
         Returns:
             True if silent, False otherwise
         """
-        level = self.get_audio_level(audio_data)
-        return level < threshold
+        if len(audio_data) == 0:
+            return threshold > 0.0
+        
+        # Compare mean square against threshold squared to skip the sqrt
+        return self._sum_of_squares(audio_data) < threshold * threshold * audio_data.size
 
 
 class RealTimeAnalyzer:
@@ -279,12 +581,39 @@ class RealTimeAnalyzer:
         self.recorder = recorder
         self.callback = callback
         self.is_analyzing = False
-        self.analysis_thread = None
+        self._analysis_func = None
+        self._executor = None
+        self._pending = None
         
+    @staticmethod
+    def njit_analysis(func: Callable) -> Callable:
+        """
+        Compile a numerical analysis function with numba, releasing the GIL
+        
+        A compiled analysis_func runs on the worker thread without holding
+        the GIL, so it doesn't hold up the audio callback. Use it as a
+        decorator on functions that only take and return arrays/numbers.
+        
+        Args:
+            func: Function to compile
+            
+        Returns:
+            The compiled function (func itself if numba is not installed)
+        """
+        if not NUMBA_AVAILABLE:
+            return func
+        from numba import njit
+        return njit(nogil=True)(func)
+    
     def start_analysis(self, analysis_func: Callable, update_interval: float = 0.5):
         """
         Start real-time analysis
         
+        The recorder's audio callback schedules a run every update_interval
+        seconds of captured audio; runs happen one at a time on a single
+        worker thread, and a run is skipped while the previous one is busy
+        (its audio is picked up by the next run).
+        
         Args:
             analysis_func: Function to analyze audio chunks
             update_interval: How often to analyze (seconds)
@@ -293,32 +622,49 @@ class RealTimeAnalyzer:
             logger.warning("Analysis already running")
             return
         
+        # Attach first: the recorder refuses a hook while streaming to a
+        # file (_schedule is a no-op until the executor exists)
+        self.recorder.set_analysis_hook(self._schedule, update_interval)
+        self._analysis_func = analysis_func
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='realtime-analysis')
+        self._pending = None
         self.is_analyzing = True
+        logger.info("Started real-time analysis")
+    
+    def _schedule(self):
+        """Queue an analysis run (called from the audio callback)"""
+        executor = self._executor
+        if not self.is_analyzing or executor is None:
+            return
+        if self._pending is None or self._pending.done():
+            try:
+                self._pending = executor.submit(self._analyze)
+            except RuntimeError:
+                pass  # Shut down by stop_analysis in the meantime
+    
+    def _analyze(self):
+        """Analyze the audio captured since the last run"""
+        # Get current audio
+        audio = self.recorder.get_current_audio()
         
-        def analyze_loop():
-            while self.is_analyzing:
-                # Get current audio
-                audio = self.recorder.get_current_audio()
-                
-                if len(audio) > 0:
-                    # Analyze audio
-                    try:
-                        results = analysis_func(audio)
-                        
-                        if self.callback:
-                            self.callback(results)
-                    except Exception as e:
-                        logger.error(f"Error during analysis: {e}")
+        if len(audio) > 0:
+            # Analyze audio
+            try:
+                results = self._analysis_func(audio)
                 
-                time.sleep(update_interval)
-        
-        self.analysis_thread = threading.Thread(target=analyze_loop, daemon=True)
-        self.analysis_thread.start()
-        logger.info("Started real-time analysis")
+                if self.callback:
+                    self.callback(results)
+            except Exception as e:
+                logger.error(f"Error during analysis: {e}")
     
     def stop_analysis(self):
         """Stop real-time analysis"""
         self.is_analyzing = False
-        if self.analysis_thread:
-            self.analysis_thread.join(timeout=2.0)
+        self.recorder.set_analysis_hook(None)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            if self._pending is not None:
+                wait([self._pending], timeout=2.0)
+            self._executor = None
+            self._pending = None
         logger.info("Stopped real-time analysis")
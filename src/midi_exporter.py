@@ -3,21 +3,72 @@ MIDI Export Module
 Exports detected notes to MIDI files
 """
 
+import io
+import struct
 import numpy as np
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, BinaryIO, Union
 import mido
 from mido import MidiFile, MidiTrack, Message, MetaMessage
 import pretty_midi
 
-from .config import MIDI_VELOCITY, MIDI_TEMPO, MIN_NOTE_DURATION, NOTE_NAMES
-from .utils import get_logger
+from .config import MIDI_VELOCITY, MIDI_TEMPO, MIN_NOTE_DURATION, NOTE_NAMES, ensure_dirs
+from .utils import get_logger, note_durations, note_ticks
 
 logger = get_logger(__name__)
 
+# Note count above which the mido export writes the track bytes itself
+# instead of building a Message object per event
+DIRECT_WRITE_MIN_NOTES = 256
+
+# MIDI resolution used by the mido export (mido's default ticks per beat)
+TICKS_PER_BEAT = 480
+
+
+def _vlq(value: int) -> bytes:
+    """Encode a MIDI variable-length quantity"""
+    if value < 0x80:
+        return bytes((value,))
+    out = [value & 0x7F]
+    value >>= 7
+    while value:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    return bytes(reversed(out))
+
+
+def _save_midi(save: Callable[[BinaryIO], None], output_path: Union[str, BinaryIO]) -> None:
+    """
+    Serialize a MIDI file in memory, then write it out in one call
+    
+    Args:
+        save: Function writing the MIDI file to a binary file object
+        output_path: Path to save the MIDI file, or a binary file object
+            (written to directly)
+    """
+    if not isinstance(output_path, str):
+        save(output_path)
+        return
+    
+    buffer = io.BytesIO()
+    save(buffer)
+    with open(output_path, 'wb') as f:
+        f.write(buffer.getbuffer())
+
 
 class MidiExporter:
     """Class for exporting detected notes to MIDI format"""
     
+    # Pitch class of each note name
+    _NOTE_INDEX = {name: i for i, name in enumerate(NOTE_NAMES)}
+    
+    # MIDI note number of every (note name, octave) inside the 0-127 range
+    _MIDI_NUMBERS = {
+        (name, octave): (octave + 1) * 12 + i
+        for i, name in enumerate(NOTE_NAMES)
+        for octave in range(-1, 10)
+        if (octave + 1) * 12 + i <= 127
+    }
+    
     def __init__(self, tempo: int = MIDI_TEMPO, velocity: int = MIDI_VELOCITY):
         """
         Initialize MidiExporter
@@ -28,6 +79,7 @@ class MidiExporter:
         """
         self.tempo = tempo
         self.velocity = velocity
+        ensure_dirs()
         
     def create_midi_from_notes(self, notes: List[Dict],
                                output_path: str,
@@ -58,6 +110,9 @@ class MidiExporter:
         """
         Create MIDI file using mido library
         
+        Long note lists skip mido's per-event Message objects and are
+        encoded directly into the same bytes mido would write.
+        
         Args:
             notes: List of note dictionaries
             output_path: Path to save MIDI file
@@ -65,8 +120,25 @@ class MidiExporter:
         Returns:
             Path to saved MIDI file
         """
+        # Delta time since the previous note ended and duration (until the
+        # next note) for every note, in ticks
+        midi_notes = self._midi_numbers(notes)
+        valid = midi_notes >= 0
+        note_times = np.fromiter((note['time'] for note in notes), dtype=np.float64, count=len(notes))
+        delta_ticks, duration_ticks = note_ticks(note_times, valid, MIN_NOTE_DURATION, TICKS_PER_BEAT)
+        midi_notes = midi_notes[valid].tolist()
+        delta_ticks = delta_ticks[valid].tolist()
+        duration_ticks = duration_ticks[valid].tolist()
+        
+        if len(midi_notes) > DIRECT_WRITE_MIN_NOTES:
+            data = self._encode_midi_file(midi_notes, delta_ticks, duration_ticks)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            logger.info(f"Saved MIDI file (mido) to {output_path}")
+            return output_path
+        
         # Create MIDI file and track
-        mid = MidiFile()
+        mid = MidiFile(ticks_per_beat=TICKS_PER_BEAT)
         track = MidiTrack()
         mid.tracks.append(track)
         
@@ -79,47 +151,60 @@ class MidiExporter:
         # Add program change (instrument selection)
         track.append(Message('program_change', program=0, time=0))
         
-        # Convert notes to MIDI messages
-        current_time = 0
-        
-        for i, note in enumerate(notes):
-            # Calculate MIDI note number
-            midi_note = self._note_to_midi_number(note['note'], note['octave'])
-            
-            if midi_note is None:
-                continue
-            
-            # Calculate delta time (time since last event)
-            note_time = note['time']
-            delta_time = int((note_time - current_time) * 480)  # Convert to ticks
-            
-            if delta_time < 0:
-                delta_time = 0
-            
-            # Note on
-            track.append(Message('note_on', note=midi_note,
-                               velocity=self.velocity, time=delta_time))
-            
-            # Estimate note duration
-            if i < len(notes) - 1:
-                duration = notes[i + 1]['time'] - note_time
-            else:
-                duration = MIN_NOTE_DURATION
-            
-            duration = max(duration, MIN_NOTE_DURATION)
-            duration_ticks = int(duration * 480)
-            
-            # Note off
-            track.append(Message('note_off', note=midi_note,
-                               velocity=0, time=duration_ticks))
-            
-            current_time = note_time + duration
+        # Convert notes to MIDI messages, added to the track in one extend
+        messages = []
+        for midi_note, delta_time, duration in zip(midi_notes, delta_ticks, duration_ticks):
+            messages.append(Message('note_on', note=midi_note,
+                                    velocity=self.velocity, time=delta_time))
+            messages.append(Message('note_off', note=midi_note,
+                                    velocity=0, time=duration))
+        track.extend(messages)
         
         # Save MIDI file
-        mid.save(output_path)
+        _save_midi(lambda f: mid.save(file=f), output_path)
         logger.info(f"Saved MIDI file (mido) to {output_path}")
         return output_path
     
+    def _encode_midi_file(self, midi_notes: List[int], delta_ticks: List[int],
+                          duration_ticks: List[int]) -> bytes:
+        """
+        Encode the mido export's single-track file without Message objects
+        
+        Produces exactly what MidiFile.save writes for the same track (no
+        running status applies, since note_on and note_off alternate).
+        
+        Args:
+            midi_notes: MIDI note numbers
+            delta_ticks: Ticks from the previous note off to each note on
+            duration_ticks: Ticks from each note on to its note off
+            
+        Returns:
+            Complete Standard MIDI File bytes
+        """
+        if not 0 <= self.velocity <= 127:
+            raise ValueError(f"velocity must be in range 0..127, got {self.velocity}")
+        
+        name = 'Detected Melody'.encode('latin1')
+        track = bytearray()
+        # Tempo, track name and program change (instrument selection)
+        track += b'\x00\xff\x51\x03' + mido.bpm2tempo(self.tempo).to_bytes(3, 'big')
+        track += b'\x00\xff\x03' + _vlq(len(name)) + name
+        track += b'\x00\xc0\x00'
+        
+        velocity = self.velocity
+        for midi_note, delta_time, duration in zip(midi_notes, delta_ticks, duration_ticks):
+            track += _vlq(delta_time)
+            track += bytes((0x90, midi_note, velocity))
+            track += _vlq(duration)
+            track += bytes((0x80, midi_note, 0))
+        
+        # End of track
+        track += b'\x00\xff\x2f\x00'
+        
+        header = struct.pack('>hhh', 1, 1, TICKS_PER_BEAT)
+        return (b'MThd' + struct.pack('>L', len(header)) + header
+                + b'MTrk' + struct.pack('>L', len(track)) + bytes(track))
+    
     def _create_midi_pretty(self, notes: List[Dict], output_path: str) -> str:
         """
         Create MIDI file using pretty_midi library
@@ -138,54 +223,28 @@ class MidiExporter:
         instrument = pretty_midi.Instrument(program=0)  # Acoustic Grand Piano
         
         # Add notes
-        for i, note in enumerate(notes):
-            # Calculate MIDI note number
-            midi_note = self._note_to_midi_number(note['note'], note['octave'])
-            
-            if midi_note is None:
-                continue
-            
-            # Estimate note duration
-            start_time = note['time']
-            
-            if i < len(notes) - 1:
-                end_time = notes[i + 1]['time']
-            else:
-                end_time = start_time + MIN_NOTE_DURATION
-            
-            duration = end_time - start_time
-            duration = max(duration, MIN_NOTE_DURATION)
-            end_time = start_time + duration
-            
-            # Create note
-            midi_note_obj = pretty_midi.Note(
-                velocity=self.velocity,
-                pitch=midi_note,
-                start=start_time,
-                end=end_time
-            )
-            
-            instrument.notes.append(midi_note_obj)
+        instrument.notes = self._pretty_notes(notes)
         
         # Add instrument to PrettyMIDI object
         pm.instruments.append(instrument)
         
         # Save MIDI file
-        pm.write(output_path)
+        _save_midi(pm.write, output_path)
         logger.info(f"Saved MIDI file (pretty_midi) to {output_path}")
         return output_path
     
     def create_midi_from_segments(self, segments: List[Dict],
-                                  output_path: str) -> str:
+                                  output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
         """
         Create MIDI file from note segments (more accurate timing)
         
         Args:
             segments: List of note segment dictionaries
-            output_path: Path to save MIDI file
+            output_path: Path to save MIDI file, or a writable binary file
+                object (e.g. io.BytesIO) to write it to
             
         Returns:
-            Path to saved MIDI file
+            Path (or file object) the MIDI file was written to
         """
         if len(segments) == 0:
             logger.warning("No segments to export to MIDI")
@@ -197,29 +256,24 @@ class MidiExporter:
         # Create instrument
         instrument = pretty_midi.Instrument(program=0)
         
-        # Add segments as notes
-        for segment in segments:
-            midi_note = self._note_to_midi_number(segment['note'], segment['octave'])
-            
-            if midi_note is None:
-                continue
-            
-            # Create note with exact timing from segment
-            midi_note_obj = pretty_midi.Note(
-                velocity=self.velocity,
-                pitch=midi_note,
-                start=segment['start_time'],
-                end=segment['end_time']
-            )
-            
-            instrument.notes.append(midi_note_obj)
+        # Add segments as notes, with exact timing from each segment
+        midi_notes = self._midi_numbers(segments)
+        instrument.notes = [
+            pretty_midi.Note(velocity=self.velocity, pitch=midi_note,
+                             start=segment['start_time'], end=segment['end_time'])
+            for midi_note, segment in zip(midi_notes.tolist(), segments)
+            if midi_note >= 0
+        ]
         
         # Add instrument to PrettyMIDI object
         pm.instruments.append(instrument)
         
         # Save MIDI file
-        pm.write(output_path)
-        logger.info(f"Saved MIDI file from segments to {output_path}")
+        _save_midi(pm.write, output_path)
+        if isinstance(output_path, str):
+            logger.info(f"Saved MIDI file from segments to {output_path}")
+        else:
+            logger.info(f"Wrote MIDI data for {len(instrument.notes)} segments")
         return output_path
     
     def _note_to_midi_number(self, note: str, octave: int) -> Optional[int]:
@@ -233,19 +287,66 @@ class MidiExporter:
         Returns:
             MIDI note number (0-127) or None if invalid
         """
-        if note not in NOTE_NAMES:
+        midi_note = self._MIDI_NUMBERS.get((note, octave))
+        if midi_note is not None:
+            return midi_note
+        
+        if note not in self._NOTE_INDEX:
             logger.warning(f"Invalid note name: {note}")
-            return None
+        else:
+            # MIDI note range is 0-127
+            logger.warning(f"MIDI note out of range: {(octave + 1) * 12 + self._NOTE_INDEX[note]}")
+        return None
+    
+    def _midi_numbers(self, notes: List[Dict]) -> np.ndarray:
+        """
+        Convert the note name and octave of every note to a MIDI note number
         
-        note_index = NOTE_NAMES.index(note)
-        midi_note = (octave + 1) * 12 + note_index
+        Array version of _note_to_midi_number; invalid notes are logged once
+        in total rather than one by one.
         
-        # MIDI note range is 0-127
-        if midi_note < 0 or midi_note > 127:
-            logger.warning(f"MIDI note out of range: {midi_note}")
-            return None
+        Args:
+            notes: List of note (or segment) dictionaries
+            
+        Returns:
+            Integer array of MIDI note numbers, -1 where the note is invalid
+        """
+        # Unknown names and notes outside 0-127 are missing from the table
+        lookup = self._MIDI_NUMBERS.get
+        midi_notes = np.fromiter(
+            (lookup((note['note'], note['octave']), -1) for note in notes),
+            dtype=np.int64, count=len(notes)
+        )
+        invalid = int(np.count_nonzero(midi_notes < 0))
+        if invalid:
+            logger.warning(f"Skipping {invalid} notes with an invalid name or out-of-range MIDI number")
+        return midi_notes
+    
+    def _pretty_notes(self, notes: List[Dict]) -> List[pretty_midi.Note]:
+        """
+        Build pretty_midi notes, each lasting until the next note starts
+        (at least MIN_NOTE_DURATION)
+        
+        Args:
+            notes: List of note dictionaries
+            
+        Returns:
+            List of pretty_midi.Note, skipping invalid notes
+        """
+        if len(notes) == 0:
+            return []
         
-        return midi_note
+        midi_notes = self._midi_numbers(notes)
+        start_times = np.fromiter((note['time'] for note in notes), dtype=np.float64, count=len(notes))
+        end_times = start_times + note_durations(start_times, MIN_NOTE_DURATION)
+        
+        valid = midi_notes >= 0
+        return [
+            pretty_midi.Note(velocity=self.velocity, pitch=midi_note, start=start, end=end)
+            for midi_note, start, end in zip(
+                midi_notes[valid].tolist(), start_times[valid].tolist(), end_times[valid].tolist()
+            )
+        ]
     
     def get_midi_info(self, midi_path: str) -> Dict:
         """
@@ -293,37 +394,11 @@ class MidiExporter:
         # Create instrument for each track
         for track_name, notes in note_groups.items():
             instrument = pretty_midi.Instrument(program=0, name=track_name)
-            
-            for i, note in enumerate(notes):
-                midi_note = self._note_to_midi_number(note['note'], note['octave'])
-                
-                if midi_note is None:
-                    continue
-                
-                start_time = note['time']
-                
-                if i < len(notes) - 1:
-                    end_time = notes[i + 1]['time']
-                else:
-                    end_time = start_time + MIN_NOTE_DURATION
-                
-                duration = end_time - start_time
-                duration = max(duration, MIN_NOTE_DURATION)
-                end_time = start_time + duration
-                
-                midi_note_obj = pretty_midi.Note(
-                    velocity=self.velocity,
-                    pitch=midi_note,
-                    start=start_time,
-                    end=end_time
-                )
-                
-                instrument.notes.append(midi_note_obj)
-            
+            instrument.notes = self._pretty_notes(notes)
             pm.instruments.append(instrument)
         
         # Save MIDI file
-        pm.write(output_path)
+        _save_midi(pm.write, output_path)
         logger.info(f"Saved multi-track MIDI file to {output_path}")
         return output_path
     
@@ -339,13 +414,13 @@ class MidiExporter:
         Returns:
             List of quantized notes
         """
-        quantized_notes = []
+        # Round every onset to the nearest grid point at once
+        times = np.fromiter((note['time'] for note in notes), dtype=np.float64, count=len(notes))
+        quantized_times = np.round(times / grid) * grid
         
-        for note in notes:
-            quantized_note = note.copy()
-            # Round to nearest grid point
-            quantized_note['time'] = round(note['time'] / grid) * grid
-            quantized_notes.append(quantized_note)
+        quantized_notes = [
+            {**note, 'time': time} for note, time in zip(notes, quantized_times.tolist())
+        ]
         
         logger.info(f"Quantized {len(notes)} notes to {grid}s grid")
         return quantized_notes
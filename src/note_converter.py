@@ -180,18 +180,22 @@ class NoteConverter:
         return segments
     
     def get_note_statistics(self, frequencies: np.ndarray,
-                           times: np.ndarray) -> Dict:
+                           times: np.ndarray,
+                           notes: Optional[List[Dict]] = None) -> Dict:
         """
         Get statistics about detected notes
         
         Args:
             frequencies: Array of frequencies
             times: Array of timestamps
+            notes: Output of frequencies_to_notes for the same arrays, if the
+                caller already has it (skips converting every frame again)
             
         Returns:
             Dictionary of note statistics
         """
-        notes = self.frequencies_to_notes(frequencies, times)
+        if notes is None:
+            notes = self.frequencies_to_notes(frequencies, times)
         
         if len(notes) == 0:
             return {
@@ -3,6 +3,7 @@ Pitch Detection Module
 Implements multiple pitch detection algorithms
 """
 
+import importlib.util
 import numpy as np
 import librosa
 from typing import Tuple, Optional, Dict
@@ -15,19 +16,16 @@ try:
 except ImportError:
     AUBIO_AVAILABLE = False
     
-try:
-    import crepe
-    CREPE_AVAILABLE = True
-except ImportError:
-    CREPE_AVAILABLE = False
+# CREPE pulls in TensorFlow, so only probe for it here; the actual import
+# happens in _detect_pitch_crepe when the method is selected
+CREPE_AVAILABLE = importlib.util.find_spec('crepe') is not None
 
 from .config import (
     SAMPLE_RATE, HOP_LENGTH, N_FFT,
     PITCH_METHODS, ERROR_MESSAGES
 )
 from .utils import (
-    get_logger, smooth_array, remove_outliers,
-    create_timestamp_array, interpolate_gaps
+    get_logger, create_timestamp_array, peak_amplitude, post_process_contour
 )
 
 logger = get_logger(__name__)
@@ -101,7 +99,8 @@ class PitchDetector:
             import crepe
             
             # CREPE expects audio in range [-1, 1]
-            audio_data = audio_data / np.max(np.abs(audio_data)) if np.max(np.abs(audio_data)) > 0 else audio_data
+            peak = peak_amplitude(audio_data)
+            audio_data = audio_data / peak if peak > 0 else audio_data
             
             time, frequency, confidence, activation = crepe.predict(
                 audio_data,
@@ -273,28 +272,13 @@ class PitchDetector:
         Returns:
             Processed frequencies
         """
-        processed = frequencies.copy()
-        
-        # Remove low-confidence detections
-        processed[confidences < 0.5] = 0
-        
-        # Remove outliers
-        if remove_outliers_flag:
-            non_zero_mask = processed > 0
-            if np.any(non_zero_mask):
-                processed[non_zero_mask] = remove_outliers(processed[non_zero_mask])
-        
-        # Interpolate small gaps
-        if interpolate:
-            processed = interpolate_gaps(processed, max_gap=5)
-        
-        # Smooth the contour
-        if smooth:
-            non_zero_mask = processed > 0
-            if np.any(non_zero_mask):
-                processed[non_zero_mask] = smooth_array(processed[non_zero_mask], window_size=5)
-        
-        return processed
+        return post_process_contour(
+            frequencies, confidences,
+            min_confidence=0.5,
+            smooth=smooth,
+            remove_outliers_flag=remove_outliers_flag,
+            interpolate=interpolate
+        )
     
     def get_pitch_statistics(self, frequencies: np.ndarray,
                             confidences: np.ndarray) -> Dict[str, float]:
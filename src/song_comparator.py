@@ -6,7 +6,7 @@ Compares two songs to analyze similarity in notes, timing, and overall structure
 import json
 import numpy as np
 from collections import Counter
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -261,13 +261,17 @@ class SongComparator:
         else:
             return 'F (Needs Improvement)'
     
-    def compare_songs(self, original_json: str, comparison_json: str) -> Dict[str, Any]:
+    def compare_songs(self, original_json: str, comparison_json: str,
+                      original_data: Optional[Dict[str, Any]] = None,
+                      comparison_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Complete comparison of two songs.
         
         Args:
             original_json: Path to original song's JSON analysis file
             comparison_json: Path to comparison song's JSON analysis file
+            original_data: Already-parsed original song data (skips loading the file)
+            comparison_data: Already-parsed comparison song data (skips loading the file)
             
         Returns:
             Complete comparison report
@@ -275,8 +279,10 @@ class SongComparator:
         logger.info(f"Comparing songs: {original_json} vs {comparison_json}")
         
         # Load both songs
-        original_data = self.load_song_data(original_json)
-        comparison_data = self.load_song_data(comparison_json)
+        if original_data is None:
+            original_data = self.load_song_data(original_json)
+        if comparison_data is None:
+            comparison_data = self.load_song_data(comparison_json)
         
         # Extract notes
         notes1 = self.extract_notes(original_data)
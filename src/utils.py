@@ -3,10 +3,25 @@ Utility functions for the Music Analyzer application
 """
 
 import os
+import json
 import logging
+import importlib.util
+from functools import lru_cache
 from typing import Optional, Tuple
 import numpy as np
 
+# Optional JIT compilation for the per-frame/per-sample array loops. Only
+# numba's presence is checked here; the kernels (and numba itself) are
+# imported on first use by _jit_kernels, keeping them off the startup path.
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Optional fast JSON encoder/decoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +32,26 @@ def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
     return logging.getLogger(name)
 
+@lru_cache(maxsize=1)
+def _load_jit_kernels():
+    """Import (and so compile or load from cache) the numba kernels once"""
+    try:
+        from . import _numba_kernels
+    except Exception as e:
+        get_logger(__name__).warning(f"numba kernels unavailable, using NumPy: {e}")
+        return None
+    return _numba_kernels
+
+def _jit_kernels():
+    """
+    The numba kernels module, or None to use the NumPy implementations
+    
+    Returns:
+        src._numba_kernels when numba is installed and importable, else None
+    """
+    return _load_jit_kernels() if NUMBA_AVAILABLE else None
+
+@lru_cache(maxsize=256)
 def validate_url(url: str) -> bool:
     """
     Validate if a string is a valid URL
@@ -92,6 +127,37 @@ def get_file_size_mb(filepath: str) -> float:
         return 0.0
     return os.path.getsize(filepath) / (1024 * 1024)
 
+def dumps_json(data) -> bytes:
+    """
+    Serialize data to indented JSON bytes (orjson when available)
+    
+    Args:
+        data: JSON-serializable object (numpy arrays/scalars allowed with orjson)
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def loads_json(data):
+    """
+    Parse JSON from bytes or str (orjson when available)
+    
+    Args:
+        data: JSON document as bytes or str
+        
+    Returns:
+        Parsed object
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def smooth_array(data: np.ndarray, window_size: int = 5) -> np.ndarray:
     """
     Smooth an array using a moving average
@@ -109,8 +175,18 @@ def smooth_array(data: np.ndarray, window_size: int = 5) -> np.ndarray:
     if len(data) < window_size:
         return data
     
+    kernels = _jit_kernels()
+    if kernels is not None:
+        return kernels.moving_average(np.asarray(data, dtype=np.float64), window_size)
+    
+    return np.convolve(data, _box_kernel(window_size), mode='same')
+
+@lru_cache(maxsize=16)
+def _box_kernel(window_size: int) -> np.ndarray:
+    """Moving-average weights for smooth_array, built once per window size"""
     kernel = np.ones(window_size) / window_size
-    return np.convolve(data, kernel, mode='same')
+    kernel.flags.writeable = False
+    return kernel
 
 def remove_outliers(data: np.ndarray, threshold: float = 3.0) -> np.ndarray:
     """
@@ -126,6 +202,10 @@ def remove_outliers(data: np.ndarray, threshold: float = 3.0) -> np.ndarray:
     if len(data) == 0:
         return data
     
+    kernels = _jit_kernels()
+    if kernels is not None:
+        return kernels.remove_outliers(np.asarray(data, dtype=np.float64), threshold)
+    
     median = np.median(data)
     mad = np.median(np.abs(data - median))
     
@@ -138,6 +218,29 @@ def remove_outliers(data: np.ndarray, threshold: float = 3.0) -> np.ndarray:
     
     return filtered_data
 
+def peak_amplitude(data: np.ndarray) -> float:
+    """
+    Largest absolute sample value, without an np.abs temporary
+    
+    Args:
+        data: Input array (integer samples are widened first, so the most
+            negative value, e.g. -32768 for int16, does not wrap)
+        
+    Returns:
+        Peak amplitude (0.0 for an empty array)
+    """
+    if data.size == 0:
+        return 0.0
+    
+    if np.issubdtype(data.dtype, np.integer):
+        data = data.astype(np.int64)
+    
+    kernels = _jit_kernels()
+    if kernels is not None and data.ndim == 1:
+        return float(kernels.peak_amplitude(data))
+    
+    return float(max(data.max(), -data.min()))
+
 def create_timestamp_array(duration: float, hop_length: int, sr: int) -> np.ndarray:
     """
     Create array of timestamps for audio frames
@@ -199,3 +302,116 @@ def interpolate_gaps(data: np.ndarray, max_gap: int = 5) -> np.ndarray:
     result[mask] = np.interp(indices[mask], valid_indices, valid_values)
     
     return result
+
+def post_process_contour(frequencies: np.ndarray, confidences: np.ndarray,
+                         min_confidence: float = 0.5,
+                         smooth: bool = True,
+                         remove_outliers_flag: bool = True,
+                         interpolate: bool = True,
+                         window_size: int = 5,
+                         outlier_threshold: float = 3.0) -> np.ndarray:
+    """
+    Clean up a pitch contour: drop low-confidence frames, replace outliers,
+    fill gaps and smooth
+    
+    With numba the whole chain runs as one compiled call; otherwise
+    remove_outliers, interpolate_gaps and smooth_array are applied in turn
+    to the voiced (> 0) frames.
+    
+    Args:
+        frequencies: Pitch contour in Hz (0 = unvoiced)
+        confidences: Per-frame confidence values
+        min_confidence: Frames below this confidence are set to 0
+        smooth: Whether to smooth the contour
+        remove_outliers_flag: Whether to remove outliers
+        interpolate: Whether to interpolate gaps
+        window_size: Moving-average window for smoothing
+        outlier_threshold: Modified z-score threshold for outliers
+        
+    Returns:
+        Processed contour (same dtype as frequencies)
+    """
+    kernels = _jit_kernels()
+    if kernels is not None and frequencies.ndim == 1:
+        return kernels.post_process(
+            frequencies, np.asarray(confidences, dtype=np.float64), min_confidence,
+            smooth, remove_outliers_flag, interpolate, window_size, outlier_threshold
+        )
+    
+    processed = frequencies.copy()
+    
+    # Remove low-confidence detections
+    processed[confidences < min_confidence] = 0
+    
+    # Remove outliers
+    if remove_outliers_flag:
+        non_zero_mask = processed > 0
+        if np.any(non_zero_mask):
+            processed[non_zero_mask] = remove_outliers(processed[non_zero_mask], outlier_threshold)
+    
+    # Interpolate small gaps
+    if interpolate:
+        processed = interpolate_gaps(processed, max_gap=5)
+    
+    # Smooth the contour
+    if smooth:
+        non_zero_mask = processed > 0
+        if np.any(non_zero_mask):
+            processed[non_zero_mask] = smooth_array(processed[non_zero_mask], window_size=window_size)
+    
+    return processed
+
+def note_durations(times: np.ndarray, min_duration: float) -> np.ndarray:
+    """
+    Duration of each note when it lasts until the next onset
+    
+    Args:
+        times: Note onset times in seconds
+        min_duration: Minimum note duration in seconds (also used for the
+            last note)
+        
+    Returns:
+        Array of durations in seconds
+    """
+    durations = np.empty(len(times))
+    durations[:-1] = np.diff(times)
+    durations[-1:] = min_duration
+    return np.maximum(durations, min_duration, out=durations)
+
+def note_ticks(times: np.ndarray, valid: np.ndarray, min_duration: float,
+               ticks_per_unit: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Delta and duration ticks for a sequence of note onsets
+    
+    Each valid note lasts until the next onset (at least min_duration) and
+    its delta is measured from the end of the previous valid note, clamped
+    at 0. Invalid notes get 0 for both.
+    
+    Args:
+        times: Note onset times in seconds
+        valid: Boolean mask of notes to emit
+        min_duration: Minimum note duration in seconds
+        ticks_per_unit: Factor converting times to ticks. The MIDI
+            exporter passes TICKS_PER_BEAT, keeping its original
+            seconds x 480 mapping (one second per beat)
+        
+    Returns:
+        Tuple of (delta_ticks, duration_ticks) int64 arrays
+    """
+    times = np.asarray(times, dtype=np.float64)
+    valid = np.asarray(valid, dtype=np.bool_)
+    kernels = _jit_kernels()
+    if kernels is not None:
+        return kernels.note_ticks(times, valid, min_duration, ticks_per_unit)
+    
+    n = len(times)
+    delta_ticks = np.zeros(n, dtype=np.int64)
+    duration_ticks = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return delta_ticks, duration_ticks
+    
+    starts, durations = times[valid], note_durations(times, min_duration)[valid]
+    previous_ends = np.concatenate(([0.0], (starts + durations)[:-1]))
+    delta_ticks[valid] = np.maximum(((starts - previous_ends) * ticks_per_unit).astype(np.int64), 0)
+    duration_ticks[valid] = (durations * ticks_per_unit).astype(np.int64)
+    return delta_ticks, duration_ticks
@@ -3,22 +3,26 @@ Visualization Module
 Creates graphs and visualizations for audio analysis
 """
 
+import io
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import librosa
 import librosa.display
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union, BinaryIO
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 
-from .config import FIGURE_SIZE, DPI, COLORMAP, SAMPLE_RATE, HOP_LENGTH
+from .config import FIGURE_SIZE, DPI, COLORMAP, SAMPLE_RATE, HOP_LENGTH, ensure_dirs
 from .utils import get_logger, format_time
 
 logger = get_logger(__name__)
 
+# Where a figure is saved: a file path, or a binary file object (PNG)
+FigureTarget = Union[str, BinaryIO]
+
 
 class AudioVisualizer:
     """Class for creating audio analysis visualizations"""
@@ -33,10 +37,26 @@ class AudioVisualizer:
         """
         self.figsize = figsize
         self.dpi = dpi
+        ensure_dirs()
+    
+    def _save_figure(self, output_path: FigureTarget, description: str):
+        """
+        Save the current figure to a path or a binary file object
+        
+        Args:
+            output_path: Path (format from the extension), or a binary file
+                object to write PNG data to (not logged)
+            description: What the figure shows, for the log message
+        """
+        if hasattr(output_path, 'write'):
+            plt.savefig(output_path, format='png', dpi=self.dpi, bbox_inches='tight')
+            return
+        plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
+        logger.info(f"Saved {description} to {output_path}")
         
     def plot_waveform(self, audio_data: np.ndarray, sr: int,
                      title: str = "Audio Waveform",
-                     output_path: Optional[str] = None) -> str:
+                     output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot audio waveform
         
@@ -44,10 +64,11 @@ class AudioVisualizer:
             audio_data: Audio signal
             sr: Sample rate
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         fig, ax = plt.subplots(figsize=self.figsize)
         
@@ -61,8 +82,7 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved waveform plot to {output_path}")
+            self._save_figure(output_path, "waveform plot")
         
         plt.close()
         return output_path
@@ -70,7 +90,7 @@ class AudioVisualizer:
     def plot_pitch_over_time(self, times: np.ndarray, frequencies: np.ndarray,
                             confidences: np.ndarray,
                             title: str = "Pitch Detection Over Time",
-                            output_path: Optional[str] = None) -> str:
+                            output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot detected pitch over time
         
@@ -79,10 +99,11 @@ class AudioVisualizer:
             frequencies: Frequency array
             confidences: Confidence array
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(self.figsize[0], self.figsize[1] * 1.5))
         
@@ -111,25 +132,25 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved pitch plot to {output_path}")
+            self._save_figure(output_path, "pitch plot")
         
         plt.close()
         return output_path
     
     def plot_notes_over_time(self, notes: List[Dict],
                             title: str = "Musical Notes Over Time",
-                            output_path: Optional[str] = None) -> str:
+                            output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot musical notes over time (piano roll style)
         
         Args:
             notes: List of note dictionaries
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         if len(notes) == 0:
             logger.warning("No notes to plot")
@@ -166,25 +187,25 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved notes plot to {output_path}")
+            self._save_figure(output_path, "notes plot")
         
         plt.close()
         return output_path
     
     def plot_piano_roll(self, piano_roll_data: Dict,
                        title: str = "Piano Roll Visualization",
-                       output_path: Optional[str] = None) -> str:
+                       output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Create piano roll visualization
         
         Args:
             piano_roll_data: Dictionary with times, notes, and matrix
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         matrix = piano_roll_data['matrix']
         
@@ -212,15 +233,14 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved piano roll to {output_path}")
+            self._save_figure(output_path, "piano roll")
         
         plt.close()
         return output_path
     
     def plot_spectrogram(self, audio_data: np.ndarray, sr: int,
                         title: str = "Spectrogram",
-                        output_path: Optional[str] = None) -> str:
+                        output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot spectrogram
         
@@ -228,10 +248,11 @@ class AudioVisualizer:
             audio_data: Audio signal
             sr: Sample rate
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         fig, ax = plt.subplots(figsize=self.figsize)
         
@@ -254,15 +275,14 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved spectrogram to {output_path}")
+            self._save_figure(output_path, "spectrogram")
         
         plt.close()
         return output_path
     
     def plot_chromagram(self, audio_data: np.ndarray, sr: int,
                        title: str = "Chromagram",
-                       output_path: Optional[str] = None) -> str:
+                       output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot chromagram (pitch class representation)
         
@@ -270,10 +290,11 @@ class AudioVisualizer:
             audio_data: Audio signal
             sr: Sample rate
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         fig, ax = plt.subplots(figsize=self.figsize)
         
@@ -293,25 +314,25 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved chromagram to {output_path}")
+            self._save_figure(output_path, "chromagram")
         
         plt.close()
         return output_path
     
     def plot_note_distribution(self, note_stats: Dict,
                               title: str = "Note Distribution",
-                              output_path: Optional[str] = None) -> str:
+                              output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Plot note distribution
         
         Args:
             note_stats: Note statistics dictionary
             title: Plot title
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         if not note_stats.get('note_distribution'):
             logger.warning("No note distribution data")
@@ -339,8 +360,7 @@ class AudioVisualizer:
         plt.tight_layout()
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved note distribution to {output_path}")
+            self._save_figure(output_path, "note distribution")
         
         plt.close()
         return output_path
@@ -473,7 +493,7 @@ class AudioVisualizer:
                                 times: np.ndarray, frequencies: np.ndarray,
                                 confidences: np.ndarray, notes: List[Dict],
                                 note_stats: Dict,
-                                output_path: Optional[str] = None) -> str:
+                                output_path: Optional[FigureTarget] = None) -> Optional[FigureTarget]:
         """
         Create a comprehensive summary dashboard
         
@@ -485,10 +505,11 @@ class AudioVisualizer:
             confidences: Confidence array
             notes: List of note dictionaries
             note_stats: Note statistics
-            output_path: Path to save figure
+            output_path: Path to save figure, or a binary file object to
+                write the PNG to
             
         Returns:
-            Path to saved figure
+            Path or file object the figure was saved to
         """
         fig = plt.figure(figsize=(16, 12))
         gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.3)
@@ -560,8 +581,32 @@ class AudioVisualizer:
         plt.suptitle('Music Analysis Dashboard', fontsize=16, fontweight='bold')
         
         if output_path:
-            plt.savefig(output_path, dpi=self.dpi, bbox_inches='tight')
-            logger.info(f"Saved dashboard to {output_path}")
+            self._save_figure(output_path, "dashboard")
         
         plt.close()
         return output_path
+
+
+def render_visualization(method_name: str, args: tuple,
+                         output_path: Optional[str] = None) -> bytes:
+    """
+    Render a single AudioVisualizer plot to PNG bytes
+    
+    Module-level so it can be submitted to a process pool.
+    
+    Args:
+        method_name: Name of the AudioVisualizer plotting method
+        args: Positional arguments for the method
+        output_path: Optional path to also save the PNG to
+        
+    Returns:
+        PNG bytes (empty if the plot had no data to draw)
+    """
+    buffer = io.BytesIO()
+    getattr(AudioVisualizer(), method_name)(*args, output_path=buffer)
+    png = buffer.getvalue()
+    if png and output_path:
+        with open(output_path, 'wb') as f:
+            f.write(png)
+        logger.info(f"Saved {method_name} figure to {output_path}")
+    return png
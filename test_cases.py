@@ -42,6 +42,27 @@ def test_basic_audio_processing():
     normalized = processor.normalize_audio(audio_data)
     print(f"✓ Normalized audio range: [{normalized.min():.3f}, {normalized.max():.3f}]")
     
+    # Integer peaks must not wrap (abs(-32768) overflows int16)
+    from src.utils import peak_amplitude
+    int_audio = np.array([-32768], np.int16)
+    assert peak_amplitude(int_audio) == 32768.0, "int16 peak wrapped around"
+    int_normalized = processor.normalize_audio(np.array([-32768, 16384], np.int16))
+    assert np.allclose(int_normalized, [-1.0, 0.5]), "int16 audio normalized by the wrong peak"
+    silent_normalized = processor.normalize_audio(np.zeros(4, np.int16))
+    assert silent_normalized.dtype == np.float32, "Silent int16 audio was not converted to float32"
+    print(f"✓ int16 peak: {peak_amplitude(int_audio):.0f}, normalized: {int_normalized.tolist()}")
+    
+    # A decode-cache hit must hand back the same kind of array as a fresh decode
+    import soundfile as sf
+    wav_path = os.path.join(OUTPUT_DIR, "test_decode_cache.wav")
+    sf.write(wav_path, audio_data[:processor.sample_rate].astype(np.float32), processor.sample_rate)
+    decoded, _ = processor.load_audio(wav_path)
+    cached, _ = processor.load_audio(wav_path)
+    for array in (decoded, cached):
+        assert type(array) is np.ndarray and array.flags.writeable, "Loaded audio is not a writeable ndarray"
+    assert np.array_equal(decoded, cached), "Decode cache returned different samples"
+    print("✓ Decode-cache hit returns a writeable ndarray matching the fresh decode")
+    
     print("✅ Test passed!\n")
     return audio_data, sample_rate
 
@@ -210,6 +231,287 @@ def test_midi_export(notes, segments):
     print("\n✅ Test passed!\n")
 
 
+def test_midi_direct_encoding():
+    """Test the direct MIDI encoder against mido's MidiFile.save"""
+    print("=" * 50)
+    print("Test 6: Direct MIDI Encoding")
+    print("=" * 50)
+    
+    import src.midi_exporter as midi_exporter
+    from mido.midifiles.meta import encode_variable_int
+    
+    # Variable-length quantities at the 1/2/3-byte boundaries
+    for value in (0, 127, 128, 16383, 16384):
+        expected = bytes(encode_variable_int(value))
+        assert midi_exporter._vlq(value) == expected, f"VLQ mismatch for {value}"
+    print("✓ VLQ encoding matches mido at 0, 127, 128, 16383, 16384")
+    
+    # 300+ notes, with gaps whose tick lengths land on the VLQ boundaries
+    rng = np.random.default_rng(0)
+    gaps = rng.uniform(0.05, 1.0, 320)
+    gaps[::64] = np.array([127, 128, 16383, 16384, 200]) / 480.0
+    note_names = ['C', 'D', 'E', 'F', 'G', 'A', 'B', 'X']
+    notes = [
+        {'note': note_names[i % len(note_names)], 'octave': 3 + i % 3, 'time': float(t)}
+        for i, t in enumerate(np.cumsum(gaps))
+    ]
+    
+    exporter = MidiExporter()
+    direct_path = os.path.join(OUTPUT_DIR, "test_direct.mid")
+    mido_path = os.path.join(OUTPUT_DIR, "test_mido.mid")
+    exporter.create_midi_from_notes(notes, direct_path, method='mido')
+    
+    # Force the Message/MidiFile.save path for the same notes
+    direct_min_notes = midi_exporter.DIRECT_WRITE_MIN_NOTES
+    midi_exporter.DIRECT_WRITE_MIN_NOTES = len(notes)
+    try:
+        exporter.create_midi_from_notes(notes, mido_path, method='mido')
+    finally:
+        midi_exporter.DIRECT_WRITE_MIN_NOTES = direct_min_notes
+    
+    with open(direct_path, 'rb') as f:
+        direct_bytes = f.read()
+    with open(mido_path, 'rb') as f:
+        mido_bytes = f.read()
+    assert direct_bytes == mido_bytes, "Direct MIDI encoding differs from MidiFile.save"
+    print(f"✓ Direct encoding of {len(notes)} notes matches MidiFile.save ({len(direct_bytes)} bytes)")
+    
+    print("\n✅ Test passed!\n")
+
+
+def test_microphone_ring_buffer():
+    """Test the microphone capture ring buffer across a wrap and a grow"""
+    print("=" * 50)
+    print("Test 7: Microphone Ring Buffer")
+    print("=" * 50)
+    
+    import types
+    
+    class StubStream:
+        """Stands in for sd.RawInputStream; the test drives its callback"""
+        def __init__(self, callback=None, **kwargs):
+            self.callback = callback
+        
+        def start(self):
+            pass
+        
+        def stop(self):
+            pass
+        
+        def close(self):
+            pass
+    
+    # Stub sounddevice so no audio device (or PortAudio) is needed
+    stub = types.ModuleType('sounddevice')
+    stub.RawInputStream = StubStream
+    saved = {name: sys.modules.pop(name, None) for name in ('sounddevice', 'src.microphone_input')}
+    sys.modules['sounddevice'] = stub
+    try:
+        import src.microphone_input as microphone_input
+        microphone_input.INITIAL_BUFFER_SECONDS = 1
+        
+        for channels in (1, 2):
+            # 100-frame initial buffer, allowed to grow to 6000 frames
+            recorder = microphone_input.MicrophoneRecorder(sample_rate=100, channels=channels,
+                                                           max_duration=60)
+            recorder.start_recording()
+            callback = recorder.stream.callback
+            initial_capacity = len(recorder._buffer)
+            
+            signal = np.arange(1000 * channels, dtype=np.float32).reshape(-1, channels)
+            chunks = []
+            pos = 0
+            # 60 frames read, then 70 more wrap past the end of the buffer,
+            # then 90 more than fit force a grow while the data is wrapped
+            for frames, read in ((60, True), (70, False), (90, False), (300, False), (200, True), (250, False)):
+                callback(signal[pos:pos + frames].tobytes(), frames, None, None)
+                pos += frames
+                if read:
+                    chunks.append(recorder.get_current_audio())
+            grown_capacity = len(recorder._buffer)
+            chunks.append(recorder.stop_recording())
+            
+            audio = np.concatenate(chunks)
+            assert grown_capacity > initial_capacity, "Capture buffer did not grow"
+            assert np.array_equal(audio, signal[:pos].reshape(-1)), "Recorded samples out of order"
+            print(f"✓ {channels}-channel: {pos} frames in order across a wrap and a grow "
+                  f"({initial_capacity} → {grown_capacity} frames)")
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    
+    print("\n✅ Test passed!\n")
+
+
+def test_trim_bounds():
+    """Test the block-wise silence trim against librosa.effects.trim"""
+    print("=" * 50)
+    print("Test 8: Silence Trim Bounds")
+    print("=" * 50)
+    
+    import librosa
+    
+    rng = np.random.default_rng(1)
+    block_size = 4096  # small blocks, so signals span several of them
+    cases = [
+        ("all silent", np.zeros(10000, np.float32)),
+        ("loud edges", rng.standard_normal(5000).astype(np.float32)),
+        ("single sample", np.ones(1, np.float32)),
+    ]
+    for _ in range(20):
+        # Lengths that are not multiples of the block (or hop) size, with a
+        # burst of noise at a random position and level
+        n = int(rng.integers(1, 50000)) * 7 + 3
+        start = int(rng.integers(0, n))
+        end = int(rng.integers(start, n + 1))
+        signal = np.zeros(n, np.float32)
+        signal[start:end] = rng.standard_normal(end - start) * rng.uniform(0.01, 1.0)
+        cases.append((f"burst {start}-{end} of {n}", signal))
+    
+    for name, signal in cases:
+        expected = tuple(int(i) for i in librosa.effects.trim(signal, top_db=40)[1])
+        bounds = AudioProcessor._nonsilent_bounds(signal, 40, block_size=block_size)
+        assert bounds == expected, f"{name}: {bounds} != librosa {expected}"
+    print(f"✓ _nonsilent_bounds matches librosa.effects.trim on {len(cases)} signals")
+    
+    print("\n✅ Test passed!\n")
+
+
+def test_pitch_post_processing():
+    """Test the fused pitch post-processing against the step-by-step chain"""
+    print("=" * 50)
+    print("Test 9: Pitch Post-Processing")
+    print("=" * 50)
+    
+    import src.utils as utils
+    
+    def reference(frequencies, confidences):
+        # The original post_process_pitch chain: confidence gate, median/MAD
+        # outliers, np.interp over every gap, moving average of voiced frames
+        processed = frequencies.copy()
+        processed[confidences < 0.5] = 0
+        voiced = processed > 0
+        if np.any(voiced):
+            values = processed[voiced]
+            median = np.median(values)
+            mad = np.median(np.abs(values - median))
+            if mad != 0:
+                values = values.copy()
+                values[np.abs(0.6745 * (values - median) / mad) > 3.0] = median
+            processed[voiced] = values
+        gaps = (processed == 0) | np.isnan(processed)
+        if np.any(gaps) and not np.all(gaps):
+            indices = np.arange(len(processed))
+            processed[gaps] = np.interp(indices[gaps], indices[~gaps], processed[~gaps])
+        voiced = processed > 0
+        if np.sum(voiced) >= 5:
+            processed[voiced] = np.convolve(processed[voiced], np.ones(5) / 5, mode='same')
+        return processed
+    
+    rng = np.random.default_rng(3)
+    contours = [np.zeros(50), np.zeros(1)]
+    for _ in range(20):
+        # Random voicing with unvoiced runs at both edges and a few octave
+        # jumps for the outlier filter
+        n = int(rng.integers(12, 400))
+        contour = rng.uniform(100, 400, n)
+        contour[rng.random(n) < 0.3] = 0
+        contour[:int(rng.integers(1, 10))] = 0
+        contour[-int(rng.integers(1, 10)):] = 0
+        contour[rng.random(n) < 0.02] *= 8
+        contours.append(contour)
+    
+    numba_available = utils.NUMBA_AVAILABLE
+    for contour in contours:
+        for dtype in (np.float64, np.float32):
+            frequencies = contour.astype(dtype)
+            confidences = rng.uniform(0.3, 1.0, len(contour))
+            expected = reference(frequencies, confidences)
+            
+            fused = utils.post_process_contour(frequencies, confidences)
+            utils.NUMBA_AVAILABLE = False
+            try:
+                fallback = utils.post_process_contour(frequencies, confidences)
+            finally:
+                utils.NUMBA_AVAILABLE = numba_available
+            
+            assert fused.dtype == fallback.dtype == dtype, "Contour dtype changed"
+            assert np.allclose(fused, expected, rtol=1e-5), "Compiled post-processing differs"
+            assert np.allclose(fallback, expected, rtol=1e-5), "NumPy post-processing differs"
+    path = "numba and NumPy paths" if numba_available else "NumPy path (numba not installed)"
+    print(f"✓ {len(contours)} contours: {path} match the original chain")
+    
+    print("\n✅ Test passed!\n")
+
+
+def test_ydl_pool():
+    """Test that overlapping YoutubeDL holders don't block each other"""
+    print("=" * 50)
+    print("Test 10: YoutubeDL Pool")
+    print("=" * 50)
+    
+    import threading
+    import types
+    
+    class StubYoutubeDL:
+        """Stands in for yt_dlp.YoutubeDL; nothing is downloaded"""
+        def __init__(self, params=None):
+            self.params = params
+    
+    # Stub yt_dlp so the test needs neither the package nor a network
+    stub = types.ModuleType('yt_dlp')
+    stub.YoutubeDL = StubYoutubeDL
+    saved = sys.modules.pop('yt_dlp', None)
+    sys.modules['yt_dlp'] = stub
+    try:
+        processor = AudioProcessor()
+        opts = {'format': 'bestaudio/best', 'quiet': True}
+        held = threading.Event()
+        release = threading.Event()
+        first = []
+        
+        def hold():
+            # Stands in for a long download holding its instance
+            with processor._ydl(opts) as ydl:
+                first.append(ydl)
+                held.set()
+                release.wait(10)
+        
+        holder = threading.Thread(target=hold)
+        holder.start()
+        try:
+            assert held.wait(10), "First holder never got an instance"
+            second = []
+            
+            def use():
+                with processor._ydl(opts) as ydl:
+                    second.append(ydl)
+            
+            user = threading.Thread(target=use)
+            user.start()
+            user.join(5)
+            assert not user.is_alive(), "Second holder blocked behind the first"
+            assert second[0] is not first[0], "Busy instance was handed out twice"
+            print("✓ Second holder got its own instance while the first was busy")
+        finally:
+            release.set()
+            holder.join(10)
+        
+        with processor._ydl(opts) as ydl:
+            assert ydl in (first[0], second[0]), "Idle instance was not reused"
+        print("✓ Idle instances are reused once released")
+    finally:
+        if saved is None:
+            sys.modules.pop('yt_dlp', None)
+        else:
+            sys.modules['yt_dlp'] = saved
+    
+    print("\n✅ Test passed!\n")
+
+
 def test_complete_pipeline():
     """Test complete analysis pipeline"""
     print("\n" + "=" * 50)
@@ -297,6 +599,21 @@ def run_all_tests():
         # Test 5: MIDI Export
         test_midi_export(notes, segments)
         
+        # Test 6: Direct MIDI Encoding
+        test_midi_direct_encoding()
+        
+        # Test 7: Microphone Ring Buffer
+        test_microphone_ring_buffer()
+        
+        # Test 8: Silence Trim Bounds
+        test_trim_bounds()
+        
+        # Test 9: Pitch Post-Processing
+        test_pitch_post_processing()
+        
+        # Test 10: YoutubeDL Pool
+        test_ydl_pool()
+        
         # Complete Pipeline Test
         test_complete_pipeline()
         